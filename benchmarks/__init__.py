@@ -0,0 +1,4 @@
+"""Offline benchmarks for the Fuel Prices integration.
+
+Run from the repository root, for example ``python -m benchmarks.entity_state``.
+"""
@@ -0,0 +1,147 @@
+"""Benchmark the CPU cost of rendering a FuelStationTracker state write.
+
+Compares the previous behaviour, where every property rebuilt the station
+data, with the per-refresh snapshot used by the sensor platform.
+"""
+
+import argparse
+import json
+import random
+import time
+from types import SimpleNamespace
+
+from pyfuelprices.const import PROP_FUEL_LOCATION_SOURCE
+from pyfuelprices.fuel import Fuel
+from pyfuelprices.fuel_locations import FuelLocation
+
+from custom_components.fuel_prices.const import ATTRIBUTE_PROFILE_FULL, ATTRIBUTE_PROFILES
+from custom_components.fuel_prices.sensor import FuelStationTracker
+
+from .synthetic import build_history
+
+
+class UncachedFuelStationTracker(FuelStationTracker):
+    """Station sensor using the property implementations before snapshots."""
+
+    @property
+    def native_value(self) -> str:
+        """Return the native value of the entity."""
+        if self.state_value == "name":
+            return self._fuel_station.name
+        return self._get_fuels.get(self.state_value, self._fuel_station.name)
+
+    @property
+    def _get_fuels(self) -> dict:
+        """Return list of fuels."""
+        output = {}
+        for fuel in self._fuel_station.available_fuels:
+            output[fuel.fuel_type] = fuel.cost
+        return output
+
+    @property
+    def extra_state_attributes(self):
+        """Return extra state attributes."""
+        return {
+            **self._fuel_station.__dict__,
+            **self._get_fuels,
+            "area": self.area
+        }
+
+
+def build_entities(
+    count: int,
+    state_value: str,
+    entity_class: type[FuelStationTracker] = FuelStationTracker,
+    attribute_profile: str = ATTRIBUTE_PROFILE_FULL,
+) -> list[FuelStationTracker]:
+    """Build station sensors backed by a synthetic location cache."""
+    cache = {}
+    for i in range(count):
+        cache[str(i)] = FuelLocation.create(
+            site_id=str(i),
+            name=f"Station {i}",
+            address=f"{i} High Street",
+            lat=random.uniform(50, 56),
+            long=random.uniform(-5, 1),
+            brand="Synthetic",
+            available_fuels=[
+                Fuel(fuel_type, round(random.uniform(1.2, 1.8), 3))
+                for fuel_type in ("E5", "E10", "B7", "SDV")
+            ],
+            currency="GBP",
+            props={PROP_FUEL_LOCATION_SOURCE: "synthetic"},
+        )
+    sources = {"synthetic": SimpleNamespace(location_cache=cache)}
+    coordinator = SimpleNamespace(
+        last_update_success=True,
+        source_stale=lambda source: False,
+        api=SimpleNamespace(configured_sources=sources),
+        history=build_history(sources),
+    )
+    return [
+        entity_class(
+            coordinator=coordinator,
+            fuel_station_id=station_id,
+            entity_id="devicetracker",
+            source="synthetic",
+            area="Benchmark",
+            state_value=state_value,
+            config=None,
+            attribute_profile=attribute_profile,
+        )
+        for station_id in cache
+    ]
+
+
+def render(entities: list[FuelStationTracker]) -> float:
+    """Render one state write per entity and return the CPU time used."""
+    start = time.process_time()
+    for entity in entities:
+        # Every write follows a refresh, so the snapshot is always rebuilt.
+        entity._snapshot = None
+        entity._async_calculate_state()
+    return time.process_time() - start
+
+
+def payload_size(entities: list[FuelStationTracker]) -> float:
+    """Return the average size in bytes of the recorded state attributes."""
+    total = 0
+    for entity in entities:
+        state = entity._async_calculate_state()
+        recorded = {
+            key: value for key, value in state.attributes.items()
+            if key not in entity._unrecorded_attributes
+        }
+        total += len(json.dumps(recorded, default=str))
+    return total / len(entities)
+
+
+def main(count: int, rounds: int, state_value: str) -> None:
+    """Run the benchmark."""
+    for label, entity_class in (
+        ("before (uncached)", UncachedFuelStationTracker),
+        ("after (snapshot)", FuelStationTracker),
+    ):
+        entities = build_entities(count, state_value, entity_class)
+        best = min(render(entities) for _ in range(rounds))
+        print(
+            f"{label:<18} {best * 1e6 / count:8.1f} us CPU per state write "
+            f"({count} entities, best of {rounds})"
+        )
+    for profile in ATTRIBUTE_PROFILES:
+        entities = build_entities(count, state_value, attribute_profile=profile)
+        best = min(render(entities) for _ in range(rounds))
+        print(
+            f"profile {profile:<10} {best * 1e6 / count:8.1f} us CPU per state write, "
+            f"{payload_size(entities):6.0f} bytes of recorded attributes"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--state", default="E10",
+                        help="State value of the sensors, 'name' or a fuel type")
+    args = parser.parse_args()
+    main(args.entities, args.rounds, args.state)
@@ -0,0 +1,165 @@
+"""Benchmark the hot paths of the integration against synthetic station caches.
+
+Builds location caches of several sizes split over a few data sources and
+reports the throughput and memory of the spatial index, the service lookups,
+sensor platform setup and station sensor state writes.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from types import SimpleNamespace
+
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE, CONF_NAME, CONF_RADIUS
+
+from custom_components.fuel_prices import sensor
+from custom_components.fuel_prices.cache import ResponseCache, lookup_key
+from custom_components.fuel_prices.spatial import BatchQuery, StationIndex
+
+from .synthetic import CENTRE, build_api, build_coordinator
+
+
+def random_points(count: int, seed: int = 1) -> list[tuple[float, float]]:
+    """Return search points scattered around the centre of the synthetic data."""
+    rng = random.Random(seed)
+    return [
+        (CENTRE[0] + rng.uniform(-1.5, 1.5), CENTRE[1] + rng.uniform(-1.5, 1.5))
+        for _ in range(count)
+    ]
+
+
+async def timed(
+    func: Callable[[], Awaitable], rounds: int
+) -> float:
+    """Return the best wall time of an async callable."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(label: str, seconds: float, operations: int, unit: str = "ops") -> None:
+    """Print a benchmark result."""
+    print(
+        f"  {label:<38} {seconds * 1000:10.2f} ms "
+        f"{operations / seconds if seconds else float('inf'):12.1f} {unit}/s"
+    )
+
+
+async def run_size(count: int, source_count: int, rounds: int, queries: int) -> None:
+    """Run every benchmark for a single cache size."""
+    print(f"{count} stations over {source_count} sources")
+    tracemalloc.start()
+    api = build_api(count, source_count)
+    cache_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    index = StationIndex(api)
+    index.refresh()
+    index_memory = tracemalloc.get_traced_memory()[0] - cache_memory
+    tracemalloc.stop()
+    print(f"  {'location caches':<38} {cache_memory / 2**20:10.1f} MiB")
+    print(f"  {'spatial index':<38} {index_memory / 2**20:10.1f} MiB")
+
+    start = time.perf_counter()
+    StationIndex(api).refresh()
+    report("index build", time.perf_counter() - start, count, "stations")
+
+    coordinator = build_coordinator(api)
+    points = random_points(queries)
+    for radius in (5, 10):
+        async def locations(radius=radius):
+            for point in points:
+                await coordinator.index.find_fuel_locations_from_point(point, radius)
+        report(f"find_fuel_station radius {radius} mi", await timed(locations, rounds), queries)
+
+    async def fuels_uncached():
+        for point in points:
+            await coordinator.index.find_fuel_from_point(point, 5, "E10")
+    report("find_fuels (uncached)", await timed(fuels_uncached, rounds), queries)
+
+    response_cache = ResponseCache()
+
+    async def fuels_cached():
+        for point in points:
+            await response_cache.async_get_or_compute(
+                lookup_key("fuels", point, 5, "E10"),
+                lambda point=point: coordinator.index.find_fuel_from_point(point, 5, "E10"),
+            )
+    await fuels_cached()
+    report("find_fuels (cached)", await timed(fuels_cached, rounds), queries)
+
+    batch = [
+        BatchQuery(str(i), point, 5, ["E10", "B7"]) for i, point in enumerate(points)
+    ]
+
+    async def fuels_batch():
+        await coordinator.index.find_fuels_batch(batch)
+    report("find_fuels_batch", await timed(fuels_batch, rounds), queries, "queries")
+
+    routes = [points[i:i + 10] for i in range(0, len(points), 10)]
+
+    async def along_route():
+        for route in routes:
+            await coordinator.index.find_fuel_along_route(route, 2, "E10")
+    report("find_fuels_along_route 2 mi", await timed(along_route, rounds), len(routes), "routes")
+
+    async def cheapest():
+        for point in points:
+            coordinator.index.cheapest(point, 10, "E10", 5)
+    report("cheapest 5 within 10 mi", await timed(cheapest, rounds), queries)
+
+    area = {
+        CONF_NAME: "Benchmark",
+        CONF_LATITUDE: CENTRE[0],
+        CONF_LONGITUDE: CENTRE[1],
+        CONF_RADIUS: 10,
+    }
+    entry = SimpleNamespace(
+        entry_id="benchmark",
+        options={},
+        data={},
+        runtime_data=SimpleNamespace(areas=[area], coordinator=coordinator),
+        async_on_unload=lambda func: None,
+    )
+    entities = []
+
+    async def setup_entry():
+        entities.clear()
+        await sensor.async_setup_entry(
+            None, entry, lambda new, update_before_add=False: entities.extend(new))
+    seconds = await timed(setup_entry, rounds)
+    report(f"sensor setup ({len(entities)} entities)", seconds, len(entities), "entities")
+
+    trackers = [
+        entity for entity in entities if isinstance(entity, sensor.FuelStationTracker)
+    ]
+
+    async def render():
+        for entity in trackers:
+            entity._snapshot = None
+            entity._async_calculate_state()
+    if trackers:
+        report("station sensor state writes", await timed(render, rounds), len(trackers), "writes")
+
+
+def main(sizes: list[int], source_count: int, rounds: int, queries: int) -> None:
+    """Run the benchmark suite."""
+    for count in sizes:
+        asyncio.run(run_size(count, source_count, rounds, queries))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="Comma separated numbers of stations")
+    parser.add_argument("--sources", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=50,
+                        help="Number of lookups per service benchmark")
+    args = parser.parse_args()
+    main([int(size) for size in args.sizes.split(",")], args.sources, args.rounds, args.queries)
@@ -0,0 +1,73 @@
+"""Benchmark the time Home Assistant spends importing the integration.
+
+Each import is timed in a fresh interpreter that has already loaded the Home
+Assistant modules any integration would use, so only the cost of this
+integration and its requirements is measured. pyfuelprices is reported
+separately, as it is now only imported when a config entry is set up or a
+config flow is opened, rather than when the integration is loaded.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+PRELOAD = (
+    "aiohttp",
+    "voluptuous",
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.selector",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.components.sensor",
+)
+
+MODULES = (
+    "custom_components.fuel_prices",
+    "custom_components.fuel_prices.config_flow",
+    "custom_components.fuel_prices.diagnostics",
+    "pyfuelprices",
+)
+
+SCRIPT = """
+import importlib, sys, time
+for module in {preload!r}:
+    importlib.import_module(module)
+start = time.perf_counter()
+importlib.import_module({module!r})
+print(time.perf_counter() - start, "pyfuelprices" in sys.modules)
+"""
+
+
+def time_import(module: str) -> tuple[float, bool]:
+    """Import a module in a fresh interpreter, returning seconds and if pyfuelprices loaded."""
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(preload=PRELOAD, module=module)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    return float(output[0]), output[1] == "True"
+
+
+def main(rounds: int) -> None:
+    """Run the benchmark."""
+    for module in MODULES:
+        samples = []
+        loaded = False
+        for _ in range(rounds):
+            duration, loaded = time_import(module)
+            samples.append(duration)
+        print(
+            f"{module:<45} {statistics.median(samples) * 1000:8.1f} ms "
+            f"(pyfuelprices {'loaded' if loaded else 'not loaded'})"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rounds)
@@ -0,0 +1,380 @@
+"""Record data source responses once and replay them to load test a refresh.
+
+``record`` runs a real coordinator refresh for the given providers and areas
+and saves every response to a fixture directory. ``run`` serves those
+responses from a local aiohttp server, optionally scaled up by duplicating
+stations with jittered coordinates, and reports the refresh time, event loop
+blocking and entity state writes of the coordinator without any network.
+
+The fixture directory holds the provider configuration, including any
+credentials, so it should not be shared or committed.
+"""
+
+import argparse
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import random
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import ClientHandlerType, ClientRequest, ClientResponse, ClientSession, web
+from pyfuelprices import FuelPrices
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import frame
+
+from custom_components.fuel_prices import sensor
+from custom_components.fuel_prices.coordinator import FuelPricesCoordinator
+from custom_components.fuel_prices.metrics import Metrics
+
+MANIFEST = "manifest.json"
+LAT_KEYS = {"lat", "latitude"}
+LONG_KEYS = {"lng", "lon", "long", "longitude"}
+ID_KEYS = {"id", "site_id", "siteid", "station_id", "stationid", "node_id", "uuid"}
+# Added to integer station IDs of each copy so they stay unique.
+ID_OFFSET = 10**9
+# Event loop lag above this is reported as blocking.
+BLOCK_THRESHOLD = 0.05
+
+
+def request_key(method: str, url: str) -> str:
+    """Return the fixture key of a request."""
+    return hashlib.sha256(f"{method} {url}".encode()).hexdigest()
+
+
+def module_config(manifest: dict) -> dict:
+    """Return the pyfuelprices configuration of a fixture."""
+    return {
+        "areas": manifest["areas"],
+        "providers": manifest["providers"],
+        "timeout": manifest.get("timeout", 30),
+        "update_interval": 24,
+    }
+
+
+class Recorder:
+    """Client middleware saving every response to a fixture directory."""
+
+    def __init__(self, path: Path) -> None:
+        """Init the recorder."""
+        self.path = path
+        self.responses: dict[str, list[dict[str, Any]]] = {}
+
+    async def __call__(
+        self, request: ClientRequest, handler: ClientHandlerType
+    ) -> ClientResponse:
+        """Send the request and save its response."""
+        response = await handler(request)
+        body = await response.read()
+        key = request_key(request.method, str(request.url))
+        calls = self.responses.setdefault(key, [])
+        name = f"{key}.{len(calls)}.body"
+        (self.path / name).write_bytes(body)
+        calls.append({
+            "url": str(request.url.with_query(None)),
+            "status": response.status,
+            "content_type": response.content_type,
+            "body": name,
+        })
+        return response
+
+
+def _jitter(value: Any, copy_index: int, rng: random.Random, spread: float) -> Any:
+    """Recursively offset the coordinates and IDs of a station copy."""
+    if isinstance(value, list):
+        return [_jitter(item, copy_index, rng, spread) for item in value]
+    if not isinstance(value, dict):
+        return value
+    result = {}
+    for key, item in value.items():
+        name = key.lower()
+        if name in LAT_KEYS or name in LONG_KEYS:
+            try:
+                offset = float(item) + rng.uniform(-spread, spread)
+            except (TypeError, ValueError):
+                result[key] = item
+                continue
+            result[key] = str(offset) if isinstance(item, str) else offset
+        elif name in ID_KEYS and isinstance(item, int) and not isinstance(item, bool):
+            result[key] = item + copy_index * ID_OFFSET
+        elif name in ID_KEYS and isinstance(item, str):
+            result[key] = f"{item}-{copy_index}"
+        else:
+            result[key] = _jitter(item, copy_index, rng, spread)
+    return result
+
+
+def _has_coordinates(value: Any, depth: int = 2) -> bool:
+    """Return if a dict holds a latitude, directly or in a nested dict."""
+    if not isinstance(value, dict):
+        return False
+    if any(key.lower() in LAT_KEYS for key in value):
+        return True
+    return depth > 0 and any(_has_coordinates(item, depth - 1) for item in value.values())
+
+
+def scale_stations(data: Any, factor: int, rng: random.Random, spread: float) -> Any:
+    """Duplicate every list of stations in a JSON document ``factor`` times."""
+    if isinstance(data, dict):
+        return {
+            key: scale_stations(item, factor, rng, spread) for key, item in data.items()
+        }
+    if not isinstance(data, list):
+        return data
+    if len(data) > 0 and all(_has_coordinates(item) for item in data):
+        scaled = list(data)
+        for copy_index in range(1, factor):
+            scaled.extend(_jitter(copy.deepcopy(item), copy_index, rng, spread) for item in data)
+        return scaled
+    return [scale_stations(item, factor, rng, spread) for item in data]
+
+
+class ReplayServer:
+    """Local stand-in for the data source APIs serving recorded responses."""
+
+    def __init__(self, path: Path, manifest: dict, scale: int, spread: float) -> None:
+        """Load and scale the recorded responses."""
+        rng = random.Random(0)
+        self.responses: dict[str, list[tuple[int, str, bytes]]] = {}
+        for key, calls in manifest["responses"].items():
+            self.responses[key] = []
+            for call in calls:
+                body = (path / call["body"]).read_bytes()
+                if scale > 1 and "json" in call["content_type"]:
+                    body = json.dumps(
+                        scale_stations(json.loads(body), scale, rng, spread)
+                    ).encode()
+                self.responses[key].append((call["status"], call["content_type"], body))
+        self._calls: dict[str, int] = {}
+        self.misses = 0
+        self.bytes_served = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Serve the next recorded response of a request."""
+        key = request.match_info["key"]
+        calls = self.responses.get(key)
+        if not calls:
+            self.misses += 1
+            return web.Response(status=404)
+        index = self._calls.get(key, 0)
+        self._calls[key] = index + 1
+        status, content_type, body = calls[index % len(calls)]
+        self.bytes_served += len(body)
+        return web.Response(status=status, body=body, content_type=content_type)
+
+    @asynccontextmanager
+    async def serve(self) -> AsyncIterator[str]:
+        """Run the server on a free local port and yield its base URL."""
+        app = web.Application()
+        app.router.add_route("*", "/{key}", self.handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            yield f"http://127.0.0.1:{port}"
+        finally:
+            await runner.cleanup()
+
+
+class Replayer:
+    """Client middleware sending every request to the replay server instead."""
+
+    def __init__(self, session: ClientSession) -> None:
+        """Init the middleware with a session bound to the replay server."""
+        self._session = session
+
+    async def __call__(
+        self, request: ClientRequest, handler: ClientHandlerType
+    ) -> ClientResponse:
+        """Fetch the recorded response of the request."""
+        return await self._session.request(
+            request.method, f"/{request_key(request.method, str(request.url))}"
+        )
+
+
+class LoopMonitor:
+    """Measure how long the event loop is blocked by sampling its lag."""
+
+    def __init__(self, interval: float = 0.01) -> None:
+        """Init the monitor."""
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+        self.max_lag = 0.0
+        self.blocked = 0.0
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self._interval)
+            lag = loop.time() - start - self._interval
+            self.max_lag = max(self.max_lag, lag)
+            if lag > BLOCK_THRESHOLD:
+                self.blocked += lag
+
+    def start(self) -> None:
+        """Start sampling."""
+        self.max_lag = self.blocked = 0.0
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+
+
+async def _async_hass(config_dir: str) -> HomeAssistant:
+    """Return a bare Home Assistant instance for the coordinator."""
+    hass = HomeAssistant(config_dir)
+    frame.async_setup(hass)
+    return hass
+
+
+async def record(path: Path, providers: dict, areas: list[dict]) -> None:
+    """Record the responses of a full refresh into a fixture directory."""
+    path.mkdir(parents=True, exist_ok=True)
+    recorder = Recorder(path)
+    manifest = {"providers": providers, "areas": areas}
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _async_hass(config_dir)
+        async with ClientSession(middlewares=(recorder,)) as session:
+            api = FuelPrices.create(client_session=session, configuration=module_config(manifest))
+            coordinator = FuelPricesCoordinator(hass, api, "record")
+            await coordinator.async_refresh()
+            await coordinator.async_shutdown()
+            for src_id, state in coordinator.source_states.items():
+                print(f"{src_id}: {state.as_dict()}")
+        await hass.async_stop(force=True)
+    manifest["responses"] = recorder.responses
+    (path / MANIFEST).write_text(json.dumps(manifest, indent=2))
+    print(f"Recorded {sum(len(calls) for calls in recorder.responses.values())} responses")
+
+
+def _count_writes(entities: list, counter: dict[str, int]) -> None:
+    """Replace the state writes of entities with a counter."""
+    for entity in entities:
+        kind = type(entity).__name__
+
+        def write(kind=kind, entity=entity) -> None:
+            counter[kind] = counter.get(kind, 0) + 1
+            # Render the state as a real write would.
+            entity._async_calculate_state()
+        entity.async_write_ha_state = write
+
+
+async def run(path: Path, scale: int, spread: float, refreshes: int) -> None:
+    """Replay a fixture through a coordinator and report the refresh cost."""
+    manifest = json.loads((path / MANIFEST).read_text())
+    server = ReplayServer(path, manifest, scale, spread)
+    monitor = LoopMonitor()
+    writes: dict[str, int] = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _async_hass(config_dir)
+        async with server.serve() as base_url, ClientSession(base_url) as replay_session:
+            metrics = Metrics()
+            async with ClientSession(
+                middlewares=(metrics.request_middleware, Replayer(replay_session))
+            ) as session:
+                api = FuelPrices.create(
+                    client_session=session, configuration=module_config(manifest))
+                coordinator = FuelPricesCoordinator(hass, api, "replay", metrics=metrics)
+                entry = SimpleNamespace(
+                    entry_id="replay",
+                    options={},
+                    data={},
+                    runtime_data=SimpleNamespace(
+                        areas=manifest["areas"], coordinator=coordinator),
+                    async_on_unload=lambda func: None,
+                    async_create_background_task=(
+                        lambda hass, target, name: hass.async_create_background_task(
+                            target, name)
+                    ),
+                )
+                for refresh in range(refreshes + 1):
+                    monitor.start()
+                    start = time.perf_counter()
+                    if refresh == 0:
+                        await coordinator.async_refresh()
+                    else:
+                        await coordinator.async_force_refresh()
+                    duration = time.perf_counter() - start
+                    monitor.stop()
+                    if refresh == 0:
+                        entities = []
+                        await sensor.async_setup_entry(
+                            hass, entry,
+                            lambda new, update_before_add=False: entities.extend(new))
+                        _count_writes(entities, writes)
+                        for entity in entities:
+                            coordinator.async_add_listener(entity._handle_coordinator_update)
+                        label = "initial refresh"
+                    else:
+                        label = f"refresh {refresh}"
+                    stations = sum(
+                        len(source.location_cache or {})
+                        for source in api.configured_sources.values()
+                    )
+                    print(
+                        f"{label:<16} {duration * 1000:10.1f} ms {stations:8} stations "
+                        f"loop max lag {monitor.max_lag * 1000:8.1f} ms "
+                        f"blocked {monitor.blocked * 1000:8.1f} ms"
+                    )
+                await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+    print(f"entities {len(entities)}, state writes {writes}")
+    print(f"served {server.bytes_served} bytes, {server.misses} unrecorded requests")
+    for src_id, source_metrics in metrics.as_dict()["sources"].items():
+        print(f"{src_id}: fetch {source_metrics['fetch']}, parse {source_metrics['parse']}")
+
+
+def _area(value: str) -> dict:
+    """Parse an area given as name,latitude,longitude,radius."""
+    name, latitude, longitude, radius = value.split(",")
+    return {
+        "name": name,
+        "latitude": float(latitude),
+        "longitude": float(longitude),
+        "radius": float(radius),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    record_parser = subparsers.add_parser("record", help="Record provider responses")
+    record_parser.add_argument("fixtures", type=Path)
+    record_parser.add_argument("--provider", action="append", required=True,
+                               help="Provider to record, repeat for several")
+    record_parser.add_argument("--provider-config", default="{}",
+                               help="JSON object of provider configurations")
+    record_parser.add_argument("--area", action="append", type=_area, required=True,
+                               help="Area as name,latitude,longitude,radius")
+    run_parser = subparsers.add_parser("run", help="Replay recorded responses")
+    run_parser.add_argument("fixtures", type=Path)
+    run_parser.add_argument("--scale", type=int, default=1,
+                            help="Copies of every recorded station to serve")
+    run_parser.add_argument("--jitter", type=float, default=0.05,
+                            help="Maximum coordinate offset of copies in degrees")
+    run_parser.add_argument("--refreshes", type=int, default=3)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    if args.command == "record":
+        provider_config = json.loads(args.provider_config)
+        asyncio.run(record(
+            args.fixtures,
+            {provider: provider_config.get(provider, {}) for provider in args.provider},
+            args.area,
+        ))
+    else:
+        asyncio.run(run(args.fixtures, args.scale, args.jitter, args.refreshes))
@@ -0,0 +1,114 @@
+"""Synthetic station data for the benchmarks."""
+
+import random
+from datetime import timedelta
+from types import SimpleNamespace
+
+from homeassistant.util import dt as dt_util
+
+from pyfuelprices.const import PROP_FUEL_LOCATION_SOURCE
+from pyfuelprices.fuel import Fuel
+from pyfuelprices.fuel_locations import FuelLocation
+from pyfuelprices.sources import Source
+
+from custom_components.fuel_prices.const import DEFAULT_HISTORY_DAYS
+from custom_components.fuel_prices.history import PriceHistory
+from custom_components.fuel_prices.metrics import Metrics
+from custom_components.fuel_prices.spatial import StationIndex
+
+FUEL_TYPES = ("E5", "E10", "B7", "SDV")
+# Roughly the extent of Great Britain.
+LAT_RANGE = (50.0, 58.5)
+LONG_RANGE = (-5.5, 1.7)
+CENTRE = (52.5, -1.5)
+
+
+def build_cache(count: int, source_id: str, seed: int = 0) -> dict[str, FuelLocation]:
+    """Build a location cache of randomly placed and priced stations."""
+    rng = random.Random(f"{source_id}-{seed}")
+    cache = {}
+    for i in range(count):
+        station_id = f"{source_id}-{i}"
+        cache[station_id] = FuelLocation.create(
+            site_id=station_id,
+            name=f"Station {i}",
+            address=f"{i} High Street",
+            lat=rng.uniform(*LAT_RANGE),
+            long=rng.uniform(*LONG_RANGE),
+            brand=rng.choice(("Synthetic", "Benchmark", "Example")),
+            available_fuels=[
+                Fuel(fuel_type, round(rng.uniform(1.2, 1.8), 3))
+                for fuel_type in FUEL_TYPES
+                if rng.random() > 0.1
+            ],
+            currency="GBP",
+            props={PROP_FUEL_LOCATION_SOURCE: source_id},
+        )
+    return cache
+
+
+class SyntheticSource(Source):
+    """Data source serving a fixed location cache, searched like a plain source."""
+
+    provider_name = "synthetic"
+
+    def __init__(self, location_cache: dict[str, FuelLocation]) -> None:
+        """Init the source, it never calls out so has no real client session."""
+        super().__init__(client_session=SimpleNamespace())
+        self.location_cache = location_cache
+        self.next_update = None
+
+
+async def _no_locations(coordinates, radius, source_id="") -> list:
+    """Stand in for the on demand search of sources without a cache."""
+    return []
+
+
+def build_api(count: int, source_count: int = 3) -> SimpleNamespace:
+    """Build a stand-in FuelPrices with the stations split over several sources."""
+    sources = {}
+    for i in range(source_count):
+        source_id = f"synthetic{i}"
+        sources[source_id] = SyntheticSource(build_cache(count // source_count, source_id))
+    return SimpleNamespace(
+        configured_sources=sources,
+        find_fuel_locations_from_point=_no_locations,
+    )
+
+
+def build_history(
+    sources: dict[str, SimpleNamespace], changes: int = 10, seed: int = 0
+) -> PriceHistory:
+    """Build a price history with a few price changes per station over the last days."""
+    rng = random.Random(seed)
+    history = PriceHistory(DEFAULT_HISTORY_DAYS)
+    now = dt_util.utcnow()
+    for src_id, source in sources.items():
+        for station_id, station in source.location_cache.items():
+            for i in range(changes, -1, -1):
+                when = now - timedelta(days=DEFAULT_HISTORY_DAYS) * i / changes
+                history.record(src_id, station_id, SimpleNamespace(
+                    available_fuels=[
+                        Fuel(fuel.fuel_type, fuel.cost + rng.choice((-0.02, 0, 0.02)) * bool(i))
+                        for fuel in station.available_fuels
+                    ]
+                ), when)
+    return history
+
+
+def build_coordinator(api: SimpleNamespace) -> SimpleNamespace:
+    """Build a stand-in coordinator exposing what entities and services read."""
+    index = StationIndex(api)
+    index.refresh()
+    return SimpleNamespace(
+        api=api,
+        index=index,
+        history=build_history(api.configured_sources),
+        metrics=Metrics(),
+        last_update_success=True,
+        source_stale=lambda source: False,
+        station_changed=lambda source, station_id: True,
+        cheapest_stations=lambda area, fuel_type, count: [],
+        first_refresh_done=True,
+        async_add_listener=lambda update_callback: lambda: None,
+    )
@@ -1,11 +1,15 @@
 """Fuel Prices integration."""
 
+import importlib
 import logging
 
 from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING
 
-from pyfuelprices import FuelPrices
+import voluptuous as vol
 
+from aiohttp import ClientTimeout
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     Platform,
@@ -20,21 +24,113 @@ from homeassistant.core import (
     SupportsResponse,
 )
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
 from .const import (
     DOMAIN,
     CONF_AREAS,
     CONF_SOURCES,
+    CONF_CACHE_MAX_AGE,
+    CONF_MAX_CONCURRENT,
+    CONF_HISTORY_DAYS,
+    CONF_PRICE_CHANGE_THRESHOLD,
+    CONF_SOURCE_SCHEDULES,
+    DEFAULT_CACHE_MAX_AGE,
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_HISTORY_DAYS,
+    DEFAULT_PRICE_CHANGE_THRESHOLD,
     CONF_CHEAPEST_SENSORS,
     CONF_CHEAPEST_SENSORS_COUNT,
     CONF_CHEAPEST_SENSORS_FUEL_TYPE
 )
+from .cache import lookup_key, route_key
 from .coordinator import FuelPricesCoordinator
+from .http_cache import ConditionalRequestCache
+from .metrics import Metrics
+from .spatial import SORT_KEYS, BatchQuery, decode_polyline, paginate
 from .repairs import raise_fixable_deprecation
 
+if TYPE_CHECKING:
+    from pyfuelprices import FuelPrices
+
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS = [Platform.SENSOR]
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+LOCATION_SCHEMA = vol.Schema(
+    {
+        vol.Optional("latitude"): cv.latitude,
+        vol.Optional("longitude"): cv.longitude,
+        vol.Optional("radius"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
+)
+PAGE_SCHEMA = {
+    vol.Optional("sort_by"): vol.In(SORT_KEYS),
+    vol.Optional("limit"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Optional("offset", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Optional("fields"): vol.All(cv.ensure_list, [cv.string]),
+}
+FIND_FUEL_STATION_SCHEMA = vol.Schema(
+    {
+        vol.Optional("location"): LOCATION_SCHEMA,
+        vol.Optional("source"): cv.string,
+        **PAGE_SCHEMA,
+    }
+)
+FIND_FUELS_SCHEMA = FIND_FUEL_STATION_SCHEMA.extend(
+    {vol.Required("type"): cv.string}
+)
+FIND_FUELS_ALONG_ROUTE_SCHEMA = vol.Schema(
+    {
+        vol.Required("route"): vol.Any(cv.string, list),
+        vol.Optional("width", default=2000): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Required("type"): cv.string,
+        vol.Optional("source"): cv.string,
+        **PAGE_SCHEMA,
+    }
+)
+
+
+def _unique_query_ids(queries: list[dict]) -> list[dict]:
+    """Reject batch queries sharing an id, as their results would overwrite."""
+    seen = set()
+    for i, query in enumerate(queries):
+        query_id = query.get("id", str(i))
+        if query_id in seen:
+            raise vol.Invalid(f"Duplicate query id: {query_id}")
+        seen.add(query_id)
+    return queries
+
+
+FIND_FUELS_BATCH_SCHEMA = vol.Schema(
+    {
+        vol.Required("queries"): vol.All([
+            vol.Schema(
+                {
+                    vol.Optional("id"): cv.string,
+                    vol.Optional("location"): LOCATION_SCHEMA,
+                    vol.Optional("types", default=[]): vol.All(
+                        cv.ensure_list, [cv.string]
+                    ),
+                    vol.Optional("source"): cv.string,
+                }
+            )
+        ], _unique_query_ids),
+    }
+)
+GET_PRICE_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required("station_id"): cv.string,
+        vol.Optional("source"): cv.string,
+        vol.Optional("type"): cv.string,
+        vol.Optional("days"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
 
 
 @dataclass
@@ -44,6 +140,7 @@ class FuelPricesConfig:
     coordinator: FuelPricesCoordinator
     areas: list[dict]
     config: ConfigEntry
+    http_cache: ConditionalRequestCache | None = None
 
 
 type FuelPricesConfigEntry = ConfigEntry[FuelPricesConfig]
@@ -66,88 +163,175 @@ def _build_module_config(entry: FuelPricesConfigEntry) -> dict:
     }
 
 
-async def async_setup_entry(hass: HomeAssistant, entry: FuelPricesConfigEntry) -> bool:
-    """Create ConfigEntry."""
+def _paginate_call(call: ServiceCall, items: list[dict]) -> list[dict]:
+    """Apply the sorting, paging and fields of a service call to its results."""
+    return paginate(
+        items,
+        sort_by=call.data.get("sort_by"),
+        limit=call.data.get("limit"),
+        offset=call.data["offset"],
+        fields=call.data.get("fields"),
+    )
 
-    default_lat = hass.config.latitude
-    default_long = hass.config.longitude
-    mod_config = _build_module_config(entry)
-    for area in mod_config["areas"]:
-        if area.get(CONF_CHEAPEST_SENSORS, False) and area.get(CONF_CHEAPEST_SENSORS_FUEL_TYPE) is not None:
-            raise_fixable_deprecation(
-                hass,
-                entry,
-                CONF_CHEAPEST_SENSORS,
-                "2025.11.0"
-            )
-            break
-    if "directlease" in mod_config["providers"]:
-        raise_fixable_deprecation(
-            hass,
-            entry,
-            "directlease",
-            "2026.6.0"
-        )
-    try:
-        fuel_prices: FuelPrices = FuelPrices.create(
-            client_session=async_create_clientsession(hass),
-            configuration=mod_config
-        )
-    except Exception as err:
-        _LOGGER.error(err)
-        raise CannotConnect from err
 
-    coordinator = FuelPricesCoordinator(
-        hass=hass, api=fuel_prices, name=entry.entry_id)
-    await coordinator.async_config_entry_first_refresh()
+def _parse_route(value) -> list[tuple[float, float]]:
+    """Read a route given as an encoded polyline or a list of waypoints."""
+    try:
+        if isinstance(value, str):
+            route = decode_polyline(value)
+        else:
+            route = [
+                (float(point["latitude"]), float(point["longitude"]))
+                if isinstance(point, dict) else (float(point[0]), float(point[1]))
+                for point in value
+            ]
+    except (KeyError, IndexError, TypeError, ValueError) as err:
+        raise HomeAssistantError(
+            "The route must be an encoded polyline or a list of waypoints "
+            "with a latitude and longitude.") from err
+    if len(route) == 0:
+        raise HomeAssistantError("The route has no waypoints.")
+    return route
+
+
+def _get_entry(hass: HomeAssistant) -> FuelPricesConfigEntry:
+    """Return the loaded entry searched by the services."""
+    entries = hass.config_entries.async_loaded_entries(DOMAIN)
+    if len(entries) == 0:
+        raise HomeAssistantError("Fuel Prices has not been set up.")
+    return entries[0]
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the services once, rather than on every entry setup."""
 
     async def handle_fuel_lookup(call: ServiceCall) -> ServiceResponse:
         """Handle a fuel lookup call."""
+        coordinator = _get_entry(hass).runtime_data.coordinator
         radius = call.data.get("location", {}).get(
             "radius", 8046.72
         )  # this is in meters
         radius = radius / 1609
-        lat = call.data.get("location", {}).get("latitude", default_lat)
-        long = call.data.get("location", {}).get("longitude", default_long)
+        lat = call.data.get("location", {}).get("latitude", hass.config.latitude)
+        long = call.data.get("location", {}).get("longitude", hass.config.longitude)
         fuel_type = call.data.get("type")
         source = call.data.get("source", "")
-        try:
-            return {
-                "fuels": await fuel_prices.find_fuel_from_point(
-                    (lat, long), radius, fuel_type, source
+        with coordinator.metrics.time_service("find_fuels"):
+            if not coordinator.catalog.offers(fuel_type):
+                # No cached station sells it, skip the search.
+                return {"fuels": [], "total": 0}
+            try:
+                fuels = await coordinator.response_cache.async_get_or_compute(
+                    lookup_key("fuels", (lat, long), radius, fuel_type, source),
+                    lambda: coordinator.index.find_fuel_from_point(
+                        (lat, long), radius, fuel_type, source
+                    )
                 )
-            }
-        except ValueError as err:
-            raise HomeAssistantError(
-                "Country not available for fuel data.") from err
+            except ValueError as err:
+                raise HomeAssistantError(
+                    "Country not available for fuel data.") from err
+            return {"fuels": _paginate_call(call, fuels), "total": len(fuels)}
+
+    async def handle_route_lookup(call: ServiceCall) -> ServiceResponse:
+        """Handle a fuel lookup along a route."""
+        coordinator = _get_entry(hass).runtime_data.coordinator
+        route = _parse_route(call.data["route"])
+        width = call.data["width"] / 1609  # this is in meters
+        fuel_type = call.data.get("type")
+        source = call.data.get("source", "")
+        with coordinator.metrics.time_service("find_fuels_along_route"):
+            if not coordinator.catalog.offers(fuel_type):
+                # No cached station sells it, skip the search.
+                return {"fuels": [], "total": 0}
+            try:
+                fuels = await coordinator.response_cache.async_get_or_compute(
+                    route_key(route, width, fuel_type, source),
+                    lambda: coordinator.index.find_fuel_along_route(
+                        route, width, fuel_type, source
+                    )
+                )
+            except ValueError as err:
+                raise HomeAssistantError(
+                    "Country not available for fuel data.") from err
+            return {"fuels": _paginate_call(call, fuels), "total": len(fuels)}
 
     async def handle_fuel_location_lookup(call: ServiceCall) -> ServiceResponse:
         """Handle a fuel location lookup call."""
+        entry = _get_entry(hass)
+        coordinator = entry.runtime_data.coordinator
         radius = call.data.get("location", {}).get(
             "radius", 8046.72
         )  # this is in meters
         radius = radius / 1609
-        lat = call.data.get("location", {}).get("latitude", default_lat)
-        long = call.data.get("location", {}).get("longitude", default_long)
+        lat = call.data.get("location", {}).get("latitude", hass.config.latitude)
+        long = call.data.get("location", {}).get("longitude", hass.config.longitude)
         source = call.data.get("source", "")
-        try:
-            locations = await fuel_prices.find_fuel_locations_from_point(
-                (lat, long), radius, source
+        with coordinator.metrics.time_service("find_fuel_station"):
+            try:
+                locations = await coordinator.response_cache.async_get_or_compute(
+                    lookup_key("locations", (lat, long), radius, source=source),
+                    lambda: coordinator.index.find_fuel_locations_from_point(
+                        (lat, long), radius, source
+                    )
+                )
+            except ValueError as err:
+                raise HomeAssistantError(
+                    "Country not available for fuel data.") from err
+            items = _paginate_call(call, locations)
+
+        return {
+            "items": items,
+            "total": len(locations),
+            "sources": entry.data.get("sources", []),
+        }
+
+    async def handle_fuel_batch_lookup(call: ServiceCall) -> ServiceResponse:
+        """Handle a batch of fuel lookups."""
+        coordinator = _get_entry(hass).runtime_data.coordinator
+        queries = []
+        for i, query in enumerate(call.data["queries"]):
+            location = query.get("location", {})
+            queries.append(
+                BatchQuery(
+                    query_id=query.get("id", str(i)),
+                    coordinates=(
+                        location.get("latitude", hass.config.latitude),
+                        location.get("longitude", hass.config.longitude)
+                    ),
+                    radius=location.get("radius", 8046.72) / 1609,
+                    fuel_types=query["types"],
+                    source_id=query.get("source", "")
+                )
+            )
+        with coordinator.metrics.time_service("find_fuels_batch"):
+            try:
+                return {"results": await coordinator.index.find_fuels_batch(queries)}
+            except ValueError as err:
+                raise HomeAssistantError(
+                    "Country not available for fuel data.") from err
+
+    async def handle_price_history(call: ServiceCall) -> ServiceResponse:
+        """Handle a price history lookup."""
+        coordinator = _get_entry(hass).runtime_data.coordinator
+        if not coordinator.history.enabled:
+            raise HomeAssistantError("Price history is disabled.")
+        with coordinator.metrics.time_service("get_price_history"):
+            return coordinator.history.station_history(
+                call.data["station_id"],
+                src_id=call.data.get("source"),
+                fuel_type=call.data.get("type"),
+                days=call.data.get("days"),
             )
-        except ValueError as err:
-            raise HomeAssistantError(
-                "Country not available for fuel data.") from err
-
-        return {"items": locations, "sources": entry.data.get("sources", [])}
 
     async def handle_force_update(call: ServiceCall):
         """Handle a request to force update."""
-        await fuel_prices.update(force=True)
+        await _get_entry(hass).runtime_data.coordinator.async_force_refresh()
 
     hass.services.async_register(
         DOMAIN,
         "find_fuel_station",
         handle_fuel_location_lookup,
+        schema=FIND_FUEL_STATION_SCHEMA,
         supports_response=SupportsResponse.ONLY,
     )
 
@@ -155,16 +339,129 @@ async def async_setup_entry(hass: HomeAssistant, entry: FuelPricesConfigEntry) -
         DOMAIN,
         "find_fuels",
         handle_fuel_lookup,
+        schema=FIND_FUELS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "find_fuels_batch",
+        handle_fuel_batch_lookup,
+        schema=FIND_FUELS_BATCH_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "find_fuels_along_route",
+        handle_route_lookup,
+        schema=FIND_FUELS_ALONG_ROUTE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "get_price_history",
+        handle_price_history,
+        schema=GET_PRICE_HISTORY_SCHEMA,
         supports_response=SupportsResponse.ONLY,
     )
 
-    hass.services.async_register(DOMAIN, "force_update", handle_force_update)
+    hass.services.async_register(
+        DOMAIN, "force_update", handle_force_update, schema=vol.Schema({})
+    )
+
+    return True
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: FuelPricesConfigEntry) -> bool:
+    """Create ConfigEntry."""
+
+    mod_config = _build_module_config(entry)
+    for area in mod_config["areas"]:
+        if area.get(CONF_CHEAPEST_SENSORS, False) and area.get(CONF_CHEAPEST_SENSORS_FUEL_TYPE) is not None:
+            raise_fixable_deprecation(
+                hass,
+                entry,
+                CONF_CHEAPEST_SENSORS,
+                "2025.11.0"
+            )
+            break
+    if "directlease" in mod_config["providers"]:
+        raise_fixable_deprecation(
+            hass,
+            entry,
+            "directlease",
+            "2026.6.0"
+        )
+    # Importing pyfuelprices loads every data source module, so it is only
+    # done once an entry is set up and never on the event loop.
+    pyfuelprices = await hass.async_add_import_executor_job(
+        importlib.import_module, "pyfuelprices"
+    )
+    http_cache = ConditionalRequestCache(hass, entry.entry_id)
+    metrics = Metrics()
+    try:
+        fuel_prices: FuelPrices = pyfuelprices.FuelPrices.create(
+            client_session=async_create_clientsession(
+                hass,
+                middlewares=(http_cache, metrics.request_middleware),
+                timeout=ClientTimeout(total=mod_config["timeout"]),
+            ),
+            configuration=mod_config
+        )
+    except Exception as err:
+        _LOGGER.error(err)
+        raise CannotConnect from err
+    # configured_sources is a class attribute shared by every instance, so it
+    # still holds the sources removed from the options before a reload.
+    fuel_prices.configured_sources = {
+        src_id: source
+        for src_id, source in fuel_prices.configured_sources.items()
+        if src_id in mod_config["providers"]
+    }
+
+    coordinator = FuelPricesCoordinator(
+        hass=hass,
+        api=fuel_prices,
+        name=entry.entry_id,
+        schedules=entry.options.get(
+            CONF_SOURCE_SCHEDULES, entry.data.get(CONF_SOURCE_SCHEDULES, {})
+        ),
+        max_concurrent=entry.options.get(
+            CONF_MAX_CONCURRENT, entry.data.get(CONF_MAX_CONCURRENT, DEFAULT_MAX_CONCURRENT)
+        ),
+        metrics=metrics,
+        history_days=entry.options.get(
+            CONF_HISTORY_DAYS, entry.data.get(CONF_HISTORY_DAYS, DEFAULT_HISTORY_DAYS)
+        ),
+        price_change_threshold=entry.options.get(
+            CONF_PRICE_CHANGE_THRESHOLD, entry.data.get(
+                CONF_PRICE_CHANGE_THRESHOLD, DEFAULT_PRICE_CHANGE_THRESHOLD)
+        ),
+    )
+    cache_max_age = entry.options.get(
+        CONF_CACHE_MAX_AGE, entry.data.get(CONF_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE)
+    )
+    await coordinator.async_load_volatility()
+    await coordinator.async_load_history()
+    # Build entities from the saved stations, or from the entity registry
+    # when there are none, and refresh in the background.
+    await coordinator.store.async_restore(timedelta(hours=cache_max_age))
 
     entry.runtime_data = FuelPricesConfig(
-        coordinator=coordinator, areas=mod_config[CONF_AREAS], config=entry)
+        coordinator=coordinator,
+        areas=mod_config[CONF_AREAS],
+        config=entry,
+        http_cache=http_cache,
+    )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_create_background_task(
+        hass, coordinator.async_refresh(), f"{DOMAIN}_{entry.entry_id}_refresh"
+    )
+
     async def update_listener(hass: HomeAssistant, entry: FuelPricesConfigEntry):
         """Update listener."""
         await hass.config_entries.async_reload(entry.entry_id)
@@ -181,6 +478,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: FuelPricesConfigEntry)
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: FuelPricesConfigEntry) -> None:
+    """Remove everything saved for an entry."""
+    for key in ("locations", "price_history", "volatility"):
+        await Store(hass, 1, f"{DOMAIN}.{entry.entry_id}.{key}").async_remove()
+    await ConditionalRequestCache(hass, entry.entry_id).async_remove()
+
+
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     """Migrate old entry."""
     _LOGGER.debug("Migrating configuration from version %s",
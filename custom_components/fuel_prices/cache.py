@@ -0,0 +1,97 @@
+"""Short lived cache of service responses."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+DEFAULT_MAX_SIZE = 128
+DEFAULT_TTL = 300
+# Roughly 100 metres, close enough to share a search between callers.
+COORDINATE_PRECISION = 3
+
+
+def lookup_key(
+    kind: str, coordinates, radius: float, fuel_type: str | None = None, source: str = ""
+) -> tuple:
+    """Build a cache key from a lookup with quantized coordinates."""
+    lat, long = coordinates
+    return (
+        kind,
+        round(float(lat), COORDINATE_PRECISION),
+        round(float(long), COORDINATE_PRECISION),
+        round(float(radius), 2),
+        fuel_type,
+        source,
+    )
+
+
+def route_key(
+    route: list[tuple[float, float]], width: float, fuel_type: str, source: str = ""
+) -> tuple:
+    """Build a cache key from a route lookup with quantized coordinates."""
+    return (
+        "route",
+        tuple(
+            (round(float(lat), COORDINATE_PRECISION), round(float(long), COORDINATE_PRECISION))
+            for lat, long in route
+        ),
+        round(float(width), 2),
+        fuel_type,
+        source,
+    )
+
+
+class ResponseCache:
+    """Bounded LRU cache whose entries expire after a fixed time."""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, ttl: float = DEFAULT_TTL) -> None:
+        """Init the cache."""
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached responses."""
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return a cached response if it has not expired."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache a response, evicting the least recently used one if full."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def async_get_or_compute(
+        self, key: Hashable, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return a cached response or compute and cache it."""
+        value = self.get(key)
+        if value is None:
+            value = await compute()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        self._entries.clear()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the cache counters."""
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,111 @@
+"""Catalog of the fuel types, brands and sources of the cached stations."""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pyfuelprices import FuelPrices
+    from pyfuelprices.fuel_locations import FuelLocation
+
+
+@dataclass
+class SourceCatalog:
+    """Fuel types and brands of the stations of a single source."""
+
+    fuel_types: Counter[str] = field(default_factory=Counter)
+    brands: set[str] = field(default_factory=set)
+    stations: int = 0
+    # Stations whose fuels are only known once they are searched for.
+    dynamic: bool = False
+
+    @classmethod
+    def build(cls, stations: dict[str, FuelLocation]) -> SourceCatalog:
+        """Build the catalog of a location cache."""
+        from pyfuelprices.const import PROP_FUEL_LOCATION_DYNAMIC_BUILD
+
+        catalog = cls(stations=len(stations))
+        for station in stations.values():
+            catalog.fuel_types.update(fuel.fuel_type for fuel in station.available_fuels)
+            if station.brand:
+                catalog.brands.add(station.brand)
+            if (station.props or {}).get(PROP_FUEL_LOCATION_DYNAMIC_BUILD, False):
+                catalog.dynamic = True
+        return catalog
+
+
+class StationCatalog:
+    """Fuel types, brands and station counts of every configured source."""
+
+    def __init__(self, api: FuelPrices) -> None:
+        """Init the catalog."""
+        self.api = api
+        self._sources: dict[str, SourceCatalog] = {}
+
+    def update(self, src_id: str) -> None:
+        """Rebuild the catalog of a source after it has been updated."""
+        source = self.api.configured_sources[src_id]
+        self._sources[src_id] = SourceCatalog.build(source.location_cache or {})
+
+    def refresh(self) -> None:
+        """Build any source not in the catalog yet, such as restored stations."""
+        sources = self.api.configured_sources
+        for src_id in list(self._sources):
+            if src_id not in sources:
+                self._sources.pop(src_id)
+        for src_id in sources:
+            if src_id not in self._sources:
+                self.update(src_id)
+
+    @property
+    def sources(self) -> list[str]:
+        """Return the configured sources."""
+        self.refresh()
+        return list(self._sources)
+
+    @property
+    def fuel_counts(self) -> Counter[str]:
+        """Return the number of stations offering each fuel type."""
+        self.refresh()
+        counts: Counter[str] = Counter()
+        for catalog in self._sources.values():
+            counts.update(catalog.fuel_types)
+        return counts
+
+    @property
+    def fuel_types(self) -> list[str]:
+        """Return every fuel type offered, sorted by name."""
+        return sorted(self.fuel_counts)
+
+    @property
+    def brands(self) -> list[str]:
+        """Return every brand, sorted by name."""
+        self.refresh()
+        return sorted(set().union(*(c.brands for c in self._sources.values())))
+
+    @property
+    def complete(self) -> bool:
+        """Return if every fuel on offer is known without searching."""
+        self.refresh()
+        return all(
+            catalog.stations > 0 and not catalog.dynamic
+            for catalog in self._sources.values()
+        )
+
+    def offers(self, fuel_type: str) -> bool:
+        """Return if a fuel type could be found by a search."""
+        return not self.complete or fuel_type in self.fuel_counts
+
+    def as_dict(self) -> dict:
+        """Return the catalog."""
+        self.refresh()
+        return {
+            "sources": {
+                src_id: {"stations": catalog.stations, "dynamic": catalog.dynamic}
+                for src_id, catalog in self._sources.items()
+            },
+            "fuel_types": dict(self.fuel_counts),
+            "brands": self.brands,
+        }
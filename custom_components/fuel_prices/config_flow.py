@@ -1,7 +1,8 @@
 """Config flow for Fuel Prices."""
 
 import logging
-from typing import Any
+from functools import cache
+from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
 
@@ -18,12 +19,9 @@ from homeassistant.const import (
     CONF_TIMEOUT,
     CONF_SCAN_INTERVAL,
     CONF_LOCATION,
+    CONF_SOURCE,
 )
 
-from pyfuelprices import FuelPrices
-from pyfuelprices.sources import Source
-from pyfuelprices.sources.mapping import SOURCE_MAP
-
 from . import FuelPricesConfigEntry
 from .const import (
     DOMAIN,
@@ -31,14 +29,48 @@ from .const import (
     CONF_AREAS,
     CONF_SOURCES,
     CONF_STATE_VALUE,
-    CONF_CHEAPEST_SENSORS_FUEL_TYPE,
+    CONF_ATTRIBUTE_PROFILE,
+    CONF_CACHE_MAX_AGE,
+    CONF_MAX_CONCURRENT,
+    CONF_HISTORY_DAYS,
+    CONF_PRICE_CHANGE_THRESHOLD,
+    CONF_SOURCE_SCHEDULES,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_INTERVAL,
+    CONF_MAX_INTERVAL,
+    ATTRIBUTE_PROFILES,
+    ATTRIBUTE_PROFILE_FULL,
+    DEFAULT_CACHE_MAX_AGE,
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_HISTORY_DAYS,
+    DEFAULT_PRICE_CHANGE_THRESHOLD,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_SOURCE_TIMEOUT,
+    CONF_CHEAPEST_FUEL_TYPES,
+    CONF_CHEAPEST_COUNT,
+    DEFAULT_CHEAPEST_COUNT,
+    CONF_STATION_FUEL_TYPES,
+    CONF_STATION_BRANDS,
+    CONF_MAX_STATIONS,
+    CONF_STATION_ORDER,
+    CONF_EXCLUDE_EV_CHARGERS,
+    STATION_ORDERS,
+    STATION_ORDER_NEAREST,
+    DEFAULT_MAX_STATIONS,
 )
 
+if TYPE_CHECKING:
+    from pyfuelprices.sources import Source
+
 _LOGGER = logging.getLogger(__name__)
 
 
+@cache
 def build_sources_list() -> list[selector.SelectOptionDict]:
     """Build source configuration dict."""
+    # Loads every data source module, flows call this in the executor first.
+    from pyfuelprices.sources.mapping import SOURCE_MAP
+
     sources = []
     for src_id, src_config in SOURCE_MAP.items():
         src_config: Source = src_config[0]
@@ -67,33 +99,90 @@ AREA_SCHEMA = vol.Schema(
     }
 )
 
-SYSTEM_SCHEMA = vol.Schema(
-    {
-        vol.Optional(CONF_SOURCES): selector.SelectSelector(
-            selector.SelectSelectorConfig(
-                mode=selector.SelectSelectorMode.DROPDOWN,
-                options=build_sources_list(),
-                multiple=True,
-            )
-        ),
-        vol.Optional(CONF_TIMEOUT): selector.NumberSelector(
-            selector.NumberSelectorConfig(
-                mode=selector.NumberSelectorMode.BOX,
-                min=5,
-                max=60,
-                unit_of_measurement="s",
-            )
-        ),
-        vol.Optional(CONF_SCAN_INTERVAL): selector.NumberSelector(
-            selector.NumberSelectorConfig(
-                mode=selector.NumberSelectorMode.BOX,
-                min=1,
-                max=24,
-                unit_of_measurement="h",
-            )
-        ),
-    }
-)
+
+def _source_map() -> dict:
+    """Return the pyfuelprices source map, loaded by build_sources_list."""
+    from pyfuelprices.sources.mapping import SOURCE_MAP
+
+    return SOURCE_MAP
+
+
+def _source_requires_config(source: str) -> bool:
+    """Return if a data source needs configuring before it can be used."""
+    from pyfuelprices import FuelPrices
+
+    return FuelPrices.source_requires_config(source)
+
+
+def _get_source_config_schema(source: str) -> vol.Schema:
+    """Return the configuration schema of a data source."""
+    from pyfuelprices import FuelPrices
+
+    return FuelPrices.get_source_config_schema(source)
+
+
+@cache
+def build_system_schema() -> vol.Schema:
+    """Build the data source and update options schema."""
+    return vol.Schema(
+        {
+            vol.Optional(CONF_SOURCES): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                    options=build_sources_list(),
+                    multiple=True,
+                )
+            ),
+            vol.Optional(CONF_TIMEOUT): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    mode=selector.NumberSelectorMode.BOX,
+                    min=5,
+                    max=60,
+                    unit_of_measurement="s",
+                )
+            ),
+            vol.Optional(CONF_SCAN_INTERVAL): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    mode=selector.NumberSelectorMode.BOX,
+                    min=1,
+                    max=24,
+                    unit_of_measurement="h",
+                )
+            ),
+            vol.Optional(CONF_CACHE_MAX_AGE): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    mode=selector.NumberSelectorMode.BOX,
+                    min=0,
+                    max=168,
+                    unit_of_measurement="h",
+                )
+            ),
+            vol.Optional(CONF_MAX_CONCURRENT): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    mode=selector.NumberSelectorMode.BOX,
+                    min=1,
+                    max=10,
+                )
+            ),
+            vol.Optional(CONF_HISTORY_DAYS): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    mode=selector.NumberSelectorMode.BOX,
+                    min=0,
+                    max=30,
+                    unit_of_measurement="d",
+                )
+            ),
+            vol.Optional(CONF_PRICE_CHANGE_THRESHOLD): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    mode=selector.NumberSelectorMode.BOX,
+                    min=0,
+                    max=50,
+                    step=0.1,
+                    unit_of_measurement="%",
+                )
+            ),
+        }
+    )
 
 
 class FuelPricesConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -106,8 +195,13 @@ class FuelPricesConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     configuring_index = -1
     configuring_source = ""
     state_value = "name"
+    attribute_profile = ATTRIBUTE_PROFILE_FULL
     timeout = None
     interval = None
+    cache_max_age = DEFAULT_CACHE_MAX_AGE
+    max_concurrent = DEFAULT_MAX_CONCURRENT
+    history_days = DEFAULT_HISTORY_DAYS
+    price_change_threshold = DEFAULT_PRICE_CHANGE_THRESHOLD
 
     @property
     def configured_area_names(self) -> list[str]:
@@ -125,12 +219,17 @@ class FuelPricesConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         # users should use the options flow to adjust areas and sources.
         await self.async_set_unique_id(NAME)
         self._abort_if_unique_id_configured()
+        await self.hass.async_add_import_executor_job(build_sources_list)
         self.configured_areas = []
         self.source_configuration = {}
         self.configuring_area = {}
         self.configuring_index = -1
         self.timeout = 10
         self.interval = 24
+        self.cache_max_age = DEFAULT_CACHE_MAX_AGE
+        self.max_concurrent = DEFAULT_MAX_CONCURRENT
+        self.history_days = DEFAULT_HISTORY_DAYS
+        self.price_change_threshold = DEFAULT_PRICE_CHANGE_THRESHOLD
         return await self.async_step_main_menu()
 
     async def async_step_main_menu(self, _: None = None):
@@ -151,9 +250,17 @@ class FuelPricesConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     user_input[CONF_SOURCES], {})
                 self.timeout = user_input[CONF_TIMEOUT]
                 self.interval = user_input[CONF_SCAN_INTERVAL]
+                self.cache_max_age = user_input.get(
+                    CONF_CACHE_MAX_AGE, self.cache_max_age)
+                self.max_concurrent = user_input.get(
+                    CONF_MAX_CONCURRENT, self.max_concurrent)
+                self.history_days = user_input.get(
+                    CONF_HISTORY_DAYS, self.history_days)
+                self.price_change_threshold = user_input.get(
+                    CONF_PRICE_CHANGE_THRESHOLD, self.price_change_threshold)
             for src, config in self.source_configuration.items():
                 if (
-                    FuelPrices.source_requires_config(src)
+                    _source_requires_config(src)
                     and len(config.keys()) == 0
                 ):
                     return await self.async_step_source_config(source=src)
@@ -163,11 +270,15 @@ class FuelPricesConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="sources",
             data_schema=self.add_suggested_values_to_schema(
-                SYSTEM_SCHEMA,
+                build_system_schema(),
                 {
                     CONF_SOURCES: list(self.source_configuration.keys()),
                     CONF_TIMEOUT: self.timeout,
                     CONF_SCAN_INTERVAL: self.interval,
+                    CONF_CACHE_MAX_AGE: self.cache_max_age,
+                    CONF_MAX_CONCURRENT: self.max_concurrent,
+                    CONF_HISTORY_DAYS: self.history_days,
+                    CONF_PRICE_CHANGE_THRESHOLD: self.price_change_threshold,
                 },
             ),
         )
@@ -182,7 +293,7 @@ class FuelPricesConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self.configuring_source = source
         return self.async_show_form(
             step_id="source_config",
-            data_schema=FuelPrices.get_source_config_schema(source),
+            data_schema=_get_source_config_schema(source),
             description_placeholders={"source": source.capitalize()},
         )
 
@@ -193,7 +304,7 @@ class FuelPricesConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             if len(self.source_configuration.keys()) > 0:
                 user_input[CONF_SOURCES] = self.source_configuration
             elif self.hass.config.country is not None:
-                for src in SOURCE_MAP.items():
+                for src in _source_map().items():
                     src: Source = src[0]
                     if not (
                         src.country_code == self.hass.config.country and
@@ -211,7 +322,12 @@ class FuelPricesConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             user_input[CONF_AREAS] = self.configured_areas
             user_input[CONF_SCAN_INTERVAL] = self.interval
             user_input[CONF_TIMEOUT] = self.timeout
+            user_input[CONF_CACHE_MAX_AGE] = self.cache_max_age
+            user_input[CONF_MAX_CONCURRENT] = self.max_concurrent
+            user_input[CONF_HISTORY_DAYS] = self.history_days
+            user_input[CONF_PRICE_CHANGE_THRESHOLD] = self.price_change_threshold
             user_input[CONF_STATE_VALUE] = self.state_value
+            user_input[CONF_ATTRIBUTE_PROFILE] = self.attribute_profile
             return self.async_create_entry(title=NAME, data=user_input)
         return self.async_show_form(step_id="finished", errors=errors, last_step=True)
 
@@ -235,7 +351,13 @@ class FuelPricesOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
     configuring_source = ""
     timeout = 10
     interval = 24
+    cache_max_age = DEFAULT_CACHE_MAX_AGE
+    max_concurrent = DEFAULT_MAX_CONCURRENT
+    history_days = DEFAULT_HISTORY_DAYS
+    price_change_threshold = DEFAULT_PRICE_CHANGE_THRESHOLD
+    source_schedules = {}
     state_value = "name"
+    attribute_profile = ATTRIBUTE_PROFILE_FULL
     config_entry: FuelPricesConfigEntry
 
     @property
@@ -255,22 +377,37 @@ class FuelPricesOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
                 CONF_SOURCES: self.source_configuration,
                 CONF_SCAN_INTERVAL: self.interval,
                 CONF_TIMEOUT: self.timeout,
+                CONF_CACHE_MAX_AGE: self.cache_max_age,
+                CONF_MAX_CONCURRENT: self.max_concurrent,
+                CONF_HISTORY_DAYS: self.history_days,
+                CONF_PRICE_CHANGE_THRESHOLD: self.price_change_threshold,
+                CONF_SOURCE_SCHEDULES: self.source_schedules,
                 CONF_STATE_VALUE: self.state_value,
+                CONF_ATTRIBUTE_PROFILE: self.attribute_profile,
             },
         )
 
     def build_available_fuels_list(self) -> list:
-        """Build a list of available fuels according to data within entity registry."""
-        fuel_types = []
+        """Build a list of available fuels from the coordinator catalog."""
+        if self.config_entry.state is config_entries.ConfigEntryState.LOADED:
+            return self.config_entry.runtime_data.coordinator.catalog.fuel_types
+        # Not loaded, fall back to what the station sensors last reported.
+        fuel_types = set()
         entities = er.async_entries_for_config_entry(
             er.async_get(self.hass), self.config_entry.entry_id
         )
         for entity in entities:
-            state = self.hass.states.get(entity.entity_id).attributes
-            for k in state.get("available_fuels", {}):
-                if k not in fuel_types:
-                    fuel_types.append(k)
-        return fuel_types
+            state = self.hass.states.get(entity.entity_id)
+            if state is None:
+                continue
+            fuel_types.update(state.attributes.get("available_fuels", {}))
+        return sorted(fuel_types)
+
+    def build_available_brands_list(self) -> list:
+        """Build a list of the brands from the coordinator catalog."""
+        if self.config_entry.state is config_entries.ConfigEntryState.LOADED:
+            return self.config_entry.runtime_data.coordinator.catalog.brands
+        return []
 
     def build_compatible_sensor_states(self) -> list:
         """Build a list of compatible sensor states for use in select controls."""
@@ -280,6 +417,7 @@ class FuelPricesOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
 
     async def async_step_init(self, _: None = None):
         """User init option flow."""
+        await self.hass.async_add_import_executor_job(build_sources_list)
         self.configured_areas = self.config_entry.options.get(
             CONF_AREAS, self.config_entry.data.get(CONF_AREAS, [])
         )
@@ -293,10 +431,34 @@ class FuelPricesOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
             CONF_SCAN_INTERVAL, self.config_entry.data.get(
                 CONF_SCAN_INTERVAL, 24)
         )
+        self.cache_max_age = self.config_entry.options.get(
+            CONF_CACHE_MAX_AGE, self.config_entry.data.get(
+                CONF_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE)
+        )
+        self.max_concurrent = self.config_entry.options.get(
+            CONF_MAX_CONCURRENT, self.config_entry.data.get(
+                CONF_MAX_CONCURRENT, DEFAULT_MAX_CONCURRENT)
+        )
+        self.history_days = self.config_entry.options.get(
+            CONF_HISTORY_DAYS, self.config_entry.data.get(
+                CONF_HISTORY_DAYS, DEFAULT_HISTORY_DAYS)
+        )
+        self.price_change_threshold = self.config_entry.options.get(
+            CONF_PRICE_CHANGE_THRESHOLD, self.config_entry.data.get(
+                CONF_PRICE_CHANGE_THRESHOLD, DEFAULT_PRICE_CHANGE_THRESHOLD)
+        )
+        self.source_schedules = dict(self.config_entry.options.get(
+            CONF_SOURCE_SCHEDULES, self.config_entry.data.get(
+                CONF_SOURCE_SCHEDULES, {})
+        ))
         self.state_value = self.config_entry.options.get(
             CONF_STATE_VALUE, self.config_entry.data.get(
                 CONF_STATE_VALUE, "name")
         )
+        self.attribute_profile = self.config_entry.options.get(
+            CONF_ATTRIBUTE_PROFILE, self.config_entry.data.get(
+                CONF_ATTRIBUTE_PROFILE, ATTRIBUTE_PROFILE_FULL)
+        )
         return await self.async_step_main_menu()
 
     async def async_step_main_menu(self, _: None = None):
@@ -306,6 +468,7 @@ class FuelPricesOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
             menu_options={
                 "area_menu": "Configure areas to create devices/sensors",
                 "sources": "Configure data collector sources",
+                "source_schedule": "Configure data source update schedules",
                 "finished": "Complete re-configuration",
             },
         )
@@ -318,10 +481,20 @@ class FuelPricesOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
                     user_input[CONF_SOURCES], {})
                 self.timeout = user_input[CONF_TIMEOUT]
                 self.interval = user_input[CONF_SCAN_INTERVAL]
+                self.cache_max_age = user_input.get(
+                    CONF_CACHE_MAX_AGE, self.cache_max_age)
+                self.max_concurrent = user_input.get(
+                    CONF_MAX_CONCURRENT, self.max_concurrent)
+                self.history_days = user_input.get(
+                    CONF_HISTORY_DAYS, self.history_days)
+                self.price_change_threshold = user_input.get(
+                    CONF_PRICE_CHANGE_THRESHOLD, self.price_change_threshold)
                 self.state_value = user_input[CONF_STATE_VALUE]
+                self.attribute_profile = user_input.get(
+                    CONF_ATTRIBUTE_PROFILE, self.attribute_profile)
             for src in self.source_configuration:
                 if (
-                    FuelPrices.source_requires_config(src)
+                    _source_requires_config(src)
                     and len(self.source_configuration[src].keys()) == 0
                 ):
                     return await self.async_step_source_config(source=src)
@@ -331,7 +504,7 @@ class FuelPricesOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
         return self.async_show_form(
             step_id="sources",
             data_schema=self.add_suggested_values_to_schema(
-                SYSTEM_SCHEMA.extend(
+                build_system_schema().extend(
                     {
                         vol.Required(CONF_STATE_VALUE): selector.SelectSelector(
                             selector.SelectSelectorConfig(
@@ -341,14 +514,26 @@ class FuelPricesOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
                                 mode=selector.SelectSelectorMode.DROPDOWN,
                                 sort=True,
                             )
-                        )
+                        ),
+                        vol.Required(CONF_ATTRIBUTE_PROFILE): selector.SelectSelector(
+                            selector.SelectSelectorConfig(
+                                options=ATTRIBUTE_PROFILES,
+                                translation_key=CONF_ATTRIBUTE_PROFILE,
+                                mode=selector.SelectSelectorMode.DROPDOWN,
+                            )
+                        ),
                     }
                 ),
                 {
                     CONF_SOURCES: list(self.source_configuration.keys()),
                     CONF_TIMEOUT: self.timeout,
                     CONF_SCAN_INTERVAL: self.interval,
+                    CONF_CACHE_MAX_AGE: self.cache_max_age,
+                    CONF_MAX_CONCURRENT: self.max_concurrent,
+                    CONF_HISTORY_DAYS: self.history_days,
+                    CONF_PRICE_CHANGE_THRESHOLD: self.price_change_threshold,
                     CONF_STATE_VALUE: self.state_value,
+                    CONF_ATTRIBUTE_PROFILE: self.attribute_profile,
                 },
             ),
         )
@@ -363,10 +548,72 @@ class FuelPricesOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
         self.configuring_source = source
         return self.async_show_form(
             step_id="source_config",
-            data_schema=FuelPrices.get_source_config_schema(source),
+            data_schema=_get_source_config_schema(source),
             description_placeholders={"source": source.capitalize()},
         )
 
+    async def async_step_source_schedule(self, user_input: dict[str, Any] | None = None):
+        """Set the update interval and timeout of a single data source."""
+        if user_input is not None:
+            self.source_schedules[user_input[CONF_SOURCE]] = {
+                CONF_SCAN_INTERVAL: user_input[CONF_SCAN_INTERVAL],
+                CONF_TIMEOUT: user_input[CONF_TIMEOUT],
+                CONF_ADAPTIVE_POLLING: user_input[CONF_ADAPTIVE_POLLING],
+                CONF_MIN_INTERVAL: user_input[CONF_MIN_INTERVAL],
+                CONF_MAX_INTERVAL: user_input.get(CONF_MAX_INTERVAL),
+            }
+            return await self.async_step_main_menu()
+        return self.async_show_form(
+            step_id="source_schedule",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_SOURCE): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                            options=list(self.source_configuration.keys()),
+                        )
+                    ),
+                    vol.Required(CONF_SCAN_INTERVAL, default=60): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            mode=selector.NumberSelectorMode.BOX,
+                            min=5,
+                            max=1440,
+                            unit_of_measurement="min",
+                        )
+                    ),
+                    vol.Required(
+                        CONF_TIMEOUT, default=DEFAULT_SOURCE_TIMEOUT
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            mode=selector.NumberSelectorMode.BOX,
+                            min=5,
+                            max=600,
+                            unit_of_measurement="s",
+                        )
+                    ),
+                    vol.Required(CONF_ADAPTIVE_POLLING, default=True): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_MIN_INTERVAL, default=DEFAULT_MIN_INTERVAL
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            mode=selector.NumberSelectorMode.BOX,
+                            min=5,
+                            max=1440,
+                            unit_of_measurement="min",
+                        )
+                    ),
+                    vol.Optional(CONF_MAX_INTERVAL): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            mode=selector.NumberSelectorMode.BOX,
+                            min=5,
+                            max=1440,
+                            unit_of_measurement="min",
+                        )
+                    ),
+                }
+            ),
+        )
+
     async def async_step_area_menu(self, _: None = None) -> FlowResult:
         """Show the area menu."""
         return self.async_show_menu(
@@ -379,6 +626,86 @@ class FuelPricesOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
             },
         )
 
+    @property
+    def cheapest_schema(self) -> dict:
+        """Return the area fields used to create cheapest station sensors."""
+        return {
+            vol.Optional(CONF_CHEAPEST_FUEL_TYPES, default=[]): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=self.build_available_fuels_list(),
+                    multiple=True,
+                    custom_value=True,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                    sort=True,
+                )
+            ),
+            vol.Optional(
+                CONF_CHEAPEST_COUNT, default=DEFAULT_CHEAPEST_COUNT
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    mode=selector.NumberSelectorMode.BOX,
+                    min=1,
+                    max=10,
+                )
+            ),
+        }
+
+    @property
+    def station_filter_schema(self) -> dict:
+        """Return the area fields used to filter the station sensors created."""
+        return {
+            vol.Optional(CONF_STATION_FUEL_TYPES, default=[]): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=self.build_available_fuels_list(),
+                    multiple=True,
+                    custom_value=True,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                    sort=True,
+                )
+            ),
+            vol.Optional(CONF_STATION_BRANDS, default=[]): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=self.build_available_brands_list(),
+                    multiple=True,
+                    custom_value=True,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Optional(
+                CONF_MAX_STATIONS, default=DEFAULT_MAX_STATIONS
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    mode=selector.NumberSelectorMode.BOX,
+                    min=0,
+                    max=1000,
+                )
+            ),
+            vol.Optional(
+                CONF_STATION_ORDER, default=STATION_ORDER_NEAREST
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=STATION_ORDERS,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                    translation_key=CONF_STATION_ORDER,
+                )
+            ),
+            vol.Optional(CONF_EXCLUDE_EV_CHARGERS, default=False): selector.BooleanSelector(),
+        }
+
+    @staticmethod
+    def _area_settings(user_input: dict[str, Any]) -> dict[str, Any]:
+        """Return the sensor settings of an area from the area form."""
+        return {
+            CONF_CHEAPEST_FUEL_TYPES: user_input.get(CONF_CHEAPEST_FUEL_TYPES, []),
+            CONF_CHEAPEST_COUNT: int(user_input.get(
+                CONF_CHEAPEST_COUNT, DEFAULT_CHEAPEST_COUNT)),
+            CONF_STATION_FUEL_TYPES: user_input.get(CONF_STATION_FUEL_TYPES, []),
+            CONF_STATION_BRANDS: user_input.get(CONF_STATION_BRANDS, []),
+            CONF_MAX_STATIONS: int(user_input.get(CONF_MAX_STATIONS, DEFAULT_MAX_STATIONS)),
+            CONF_STATION_ORDER: user_input.get(CONF_STATION_ORDER, STATION_ORDER_NEAREST),
+            CONF_EXCLUDE_EV_CHARGERS: user_input.get(CONF_EXCLUDE_EV_CHARGERS, False),
+        }
+
     async def async_step_area_create(self, user_input: dict[str, Any] | None = None):
         """Handle an area configuration."""
         errors: dict[str, str] = {}
@@ -389,6 +716,7 @@ class FuelPricesOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
                     CONF_LATITUDE: user_input[CONF_LOCATION][CONF_LATITUDE],
                     CONF_LONGITUDE: user_input[CONF_LOCATION][CONF_LONGITUDE],
                     CONF_RADIUS: user_input[CONF_LOCATION][CONF_RADIUS],
+                    **self._area_settings(user_input),
                 }
             )
             return await self.async_step_area_menu()
@@ -404,19 +732,7 @@ class FuelPricesOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
         return self.async_show_form(
             step_id="area_create",
             data_schema=data_schema.extend(
-                {
-                    vol.Optional(
-                        CONF_CHEAPEST_SENSORS_FUEL_TYPE
-                    ): selector.SelectSelector(
-                        selector.SelectSelectorConfig(
-                            options=self.build_available_fuels_list(),
-                            multiple=False,
-                            custom_value=False,
-                            mode=selector.SelectSelectorMode.DROPDOWN,
-                            sort=True,
-                        )
-                    )
-                }
+                {**self.cheapest_schema, **self.station_filter_schema}
             ),
             errors=errors,
         )
@@ -469,13 +785,16 @@ class FuelPricesOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
                     CONF_LATITUDE: user_input[CONF_LOCATION][CONF_LATITUDE],
                     CONF_LONGITUDE: user_input[CONF_LOCATION][CONF_LONGITUDE],
                     CONF_RADIUS: user_input[CONF_LOCATION][CONF_RADIUS] / 1609,
+                    **self._area_settings(user_input),
                 }
             )
             return await self.async_step_area_menu()
         return self.async_show_form(
             step_id="area_update",
             data_schema=self.add_suggested_values_to_schema(
-                AREA_SCHEMA,
+                AREA_SCHEMA.extend(
+                    {**self.cheapest_schema, **self.station_filter_schema}
+                ),
                 self.configuring_area,
             ),
             errors=errors,
@@ -512,7 +831,7 @@ class FuelPricesOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
             if len(self.source_configuration.keys()) > 0:
                 user_input[CONF_SOURCES] = self.source_configuration
             elif self.hass.config.country is not None:
-                for src in SOURCE_MAP.items():
+                for src in _source_map().items():
                     src: Source = src[0]
                     if not (
                             src.country_code == self.hass.config.country and
@@ -528,7 +847,13 @@ class FuelPricesOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
             user_input[CONF_AREAS] = self.configured_areas
             user_input[CONF_SCAN_INTERVAL] = self.interval
             user_input[CONF_TIMEOUT] = self.timeout
+            user_input[CONF_CACHE_MAX_AGE] = self.cache_max_age
+            user_input[CONF_MAX_CONCURRENT] = self.max_concurrent
+            user_input[CONF_HISTORY_DAYS] = self.history_days
+            user_input[CONF_PRICE_CHANGE_THRESHOLD] = self.price_change_threshold
+            user_input[CONF_SOURCE_SCHEDULES] = self.source_schedules
             user_input[CONF_STATE_VALUE] = self.state_value
+            user_input[CONF_ATTRIBUTE_PROFILE] = self.attribute_profile
             self.options.update(user_input)
             self.hass.config_entries.async_update_entry(
                 self.config_entry, data=user_input)
@@ -8,6 +8,51 @@ CONF_SOURCES = "sources"
 CONF_SOURCE_CONFIG = "source_config"
 
 CONF_STATE_VALUE = "state"
+CONF_ATTRIBUTE_PROFILE = "attribute_profile"
+CONF_CACHE_MAX_AGE = "cache_max_age"
+CONF_MAX_CONCURRENT = "max_concurrent_updates"
+CONF_SOURCE_SCHEDULES = "source_schedules"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
+CONF_HISTORY_DAYS = "history_days"
+CONF_PRICE_CHANGE_THRESHOLD = "price_change_threshold"
+
+ATTRIBUTE_PROFILE_FULL = "full"
+ATTRIBUTE_PROFILE_PRICES = "prices"
+ATTRIBUTE_PROFILE_MINIMAL = "minimal"
+ATTRIBUTE_PROFILES = [
+    ATTRIBUTE_PROFILE_FULL,
+    ATTRIBUTE_PROFILE_PRICES,
+    ATTRIBUTE_PROFILE_MINIMAL,
+]
+
+DEFAULT_CACHE_MAX_AGE = 24
+DEFAULT_MAX_CONCURRENT = 3
+DEFAULT_MIN_INTERVAL = 15
+# Longest time a whole data source update may take, across all its requests.
+DEFAULT_SOURCE_TIMEOUT = 240
+DEFAULT_HISTORY_DAYS = 14
+DEFAULT_PRICE_CHANGE_THRESHOLD = 0
+
+EVENT_PRICE_CHANGED = f"{DOMAIN}_price_changed"
+
+CONF_CHEAPEST_FUEL_TYPES = "cheapest_fuel_types"
+CONF_CHEAPEST_COUNT = "cheapest_count"
+
+DEFAULT_CHEAPEST_COUNT = 5
+
+CONF_STATION_FUEL_TYPES = "station_fuel_types"
+CONF_STATION_BRANDS = "station_brands"
+CONF_MAX_STATIONS = "max_stations"
+CONF_STATION_ORDER = "station_order"
+CONF_EXCLUDE_EV_CHARGERS = "exclude_ev_chargers"
+
+STATION_ORDER_NEAREST = "nearest"
+STATION_ORDER_CHEAPEST = "cheapest"
+STATION_ORDERS = [STATION_ORDER_NEAREST, STATION_ORDER_CHEAPEST]
+
+DEFAULT_MAX_STATIONS = 0
 
 CONF_CHEAPEST_SENSORS = "cheapest_stations"
 CONF_CHEAPEST_SENSORS_COUNT = "cheapest_stations_count"
@@ -1,49 +1,440 @@
 """Fuel Prices data hub."""
 
+from __future__ import annotations
+
+import asyncio
 import logging
-from datetime import timedelta
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 
 import async_timeout
 
 from homeassistant.core import HomeAssistant
-from pyfuelprices import FuelPrices, UpdateExceptionGroup
-from pyfuelprices.sources import UpdateFailedError
+from homeassistant.const import (
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_NAME,
+    CONF_RADIUS,
+    CONF_SCAN_INTERVAL,
+    CONF_TIMEOUT,
+)
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
+from .const import (
+    DOMAIN,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_INTERVAL,
+    CONF_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MAX_CONCURRENT,
+    DEFAULT_SOURCE_TIMEOUT,
+    DEFAULT_HISTORY_DAYS,
+    DEFAULT_PRICE_CHANGE_THRESHOLD,
+    EVENT_PRICE_CHANGED,
+)
+from .cache import ResponseCache
+from .catalog import StationCatalog
+from .history import PriceHistory
+from .metrics import Metrics
+from .spatial import StationIndex
+from .store import LocationCacheStore
+from .volatility import VolatilityTracker
+
+if TYPE_CHECKING:
+    from pyfuelprices import FuelPrices
+    from pyfuelprices.fuel_locations import FuelLocation
+
 _LOGGER = logging.getLogger(__name__)
 
+# Shortest time between two scheduler runs.
+MIN_TICK = timedelta(minutes=1)
+# First retry delay of a failing data source, doubled on every failure.
+RETRY_BACKOFF = timedelta(minutes=5)
+# Consecutive failures before a data source is left alone for a cooldown.
+CIRCUIT_THRESHOLD = 3
+CIRCUIT_COOLDOWN = timedelta(hours=1)
+VOLATILITY_STORAGE_VERSION = 1
+VOLATILITY_SAVE_DELAY = 300
+HISTORY_STORAGE_VERSION = 1
+HISTORY_SAVE_DELAY = 600
+
+
+@dataclass
+class SourceSchedule:
+    """Represent the update schedule of a single data source."""
+
+    interval: timedelta
+    timeout: float
+    next_run: datetime
+    last_run: datetime | None = None
+    tracker: VolatilityTracker | None = None
+
+
+@dataclass
+class SourceState:
+    """Represent the health of a single data source."""
 
-class FuelPricesCoordinator(DataUpdateCoordinator):
+    last_success: datetime | None = None
+    last_failure: datetime | None = None
+    last_error: str | None = None
+    failures: int = 0
+    circuit_open_until: datetime | None = None
+    last_good: dict[str, FuelLocation] = field(default_factory=dict, repr=False)
+
+    @property
+    def stale(self) -> bool:
+        """Return if the stations are left over from an earlier update."""
+        return self.failures > 0
+
+    def circuit_open(self, now: datetime) -> bool:
+        """Return if the data source should not be called yet."""
+        return self.circuit_open_until is not None and now < self.circuit_open_until
+
+    def as_dict(self) -> dict:
+        """Return the state without the cached stations."""
+        return {
+            "last_success": self.last_success,
+            "last_failure": self.last_failure,
+            "last_error": self.last_error,
+            "failures": self.failures,
+            "stale": self.stale,
+            "circuit_open_until": self.circuit_open_until,
+            "stations": len(self.last_good),
+        }
+
+
+class FuelPricesCoordinator(DataUpdateCoordinator[dict[str, SourceState]]):
     """Fuel Prices data coordinator."""
 
-    def __init__(self, hass: HomeAssistant, api: FuelPrices, name: str) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: FuelPrices,
+        name: str,
+        schedules: dict[str, dict] | None = None,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        metrics: Metrics | None = None,
+        history_days: int = DEFAULT_HISTORY_DAYS,
+        price_change_threshold: float = DEFAULT_PRICE_CHANGE_THRESHOLD,
+    ) -> None:
         """Init the coordinator."""
         super().__init__(
             hass=hass,
             logger=_LOGGER,
             name=name,
-            update_interval=timedelta(minutes=30),
+            update_interval=MIN_TICK,
         )
         self.api: FuelPrices = api
+        self.index = StationIndex(api)
+        self.catalog = StationCatalog(api)
+        self.response_cache = ResponseCache()
+        self.metrics = metrics or Metrics()
+        self._cheapest: dict[tuple, list[dict]] = {}
+        self.store = LocationCacheStore(hass, api, name)
+        self.history = PriceHistory(history_days)
+        self._history_store: Store[dict] = Store(
+            hass, HISTORY_STORAGE_VERSION, f"{DOMAIN}.{name}.price_history"
+        )
+        self._volatility_store: Store[dict] = Store(
+            hass, VOLATILITY_STORAGE_VERSION, f"{DOMAIN}.{name}.volatility"
+        )
+        # The prices of every station, kept to spot the ones that changed.
+        self._fingerprints: dict[str, dict[str, tuple]] = {}
+        self.price_change_threshold = float(price_change_threshold)
+        # Price moves of the current refresh, fired as a single event.
+        self._price_changes: list[dict] = []
+        # None means every station should be treated as changed.
+        self.changed_stations: set[tuple[str, str]] | None = None
+        # If every data source has been tried at least once.
+        self.first_refresh_done = False
+        self._semaphore = asyncio.Semaphore(int(max_concurrent))
+        self._schedule_config = schedules or {}
+        self.schedules: dict[str, SourceSchedule] = {}
+        self.source_states: dict[str, SourceState] = {}
+        for src_id in api.configured_sources:
+            self.add_source(src_id)
+
+    def add_source(self, src_id: str) -> None:
+        """Schedule the updates of a data source of the API."""
+        source = self.api.configured_sources[src_id]
+        config = self._schedule_config.get(src_id, {})
+        interval = source.update_interval or timedelta(days=1)
+        if config.get(CONF_SCAN_INTERVAL):
+            interval = timedelta(minutes=config[CONF_SCAN_INTERVAL])
+        tracker = None
+        if config.get(CONF_ADAPTIVE_POLLING, True):
+            # Without an upper bound never poll less often than configured.
+            max_interval = interval
+            if config.get(CONF_MAX_INTERVAL):
+                max_interval = timedelta(minutes=config[CONF_MAX_INTERVAL])
+            tracker = VolatilityTracker(
+                min_interval=timedelta(minutes=config.get(
+                    CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL)),
+                max_interval=max_interval,
+            )
+        self.schedules[src_id] = SourceSchedule(
+            interval=interval,
+            timeout=config.get(CONF_TIMEOUT, DEFAULT_SOURCE_TIMEOUT),
+            next_run=dt_util.utcnow(),
+            tracker=tracker,
+        )
+        self.source_states[src_id] = SourceState()
+
+    async def async_load_volatility(self) -> None:
+        """Restore the price change rates learnt for each data source."""
+        data = await self._volatility_store.async_load() or {}
+        for src_id, schedule in self.schedules.items():
+            if schedule.tracker is not None and src_id in data:
+                schedule.tracker.load(data[src_id])
+
+    async def async_load_history(self) -> None:
+        """Restore the price history of every station."""
+        if self.history.enabled:
+            data = await self._history_store.async_load() or {}
+            # Nothing records prices before the first refresh, so unpacking
+            # thousands of series can be left to the executor.
+            await self.hass.async_add_executor_job(self.history.load, data)
+
+    def _volatility_to_save(self) -> dict:
+        """Return the learnt price change rates of every data source."""
+        return {
+            src_id: schedule.tracker.as_dict()
+            for src_id, schedule in self.schedules.items()
+            if schedule.tracker is not None
+        }
+
+    def _update_fingerprints(self, src_id: str) -> set[tuple[str, str]]:
+        """Return the stations of a source whose price changed since its last update."""
+        source = self.api.configured_sources[src_id]
+        previous = self._fingerprints.get(src_id, {})
+        fingerprints = {}
+        changed = set()
+        for station_id, station in (source.location_cache or {}).items():
+            fingerprint = tuple(
+                (fuel.fuel_type, fuel.cost) for fuel in station.available_fuels
+            )
+            fingerprints[station_id] = fingerprint
+            before = previous.get(station_id)
+            if before != fingerprint:
+                changed.add((src_id, station_id))
+                if before is not None:
+                    self._add_price_changes(
+                        src_id, station_id, station, before, fingerprint)
+        self._fingerprints[src_id] = fingerprints
+        _LOGGER.debug("%s of %s stations changed price for %s",
+                      len(changed), len(fingerprints), src_id)
+        return changed
+
+    def _add_price_changes(
+        self,
+        src_id: str,
+        station_id: str,
+        station: FuelLocation,
+        before: tuple,
+        after: tuple,
+    ) -> None:
+        """Collect the fuels of a station whose price moved past the threshold."""
+        previous_prices = dict(before)
+        for fuel_type, price in after:
+            previous = previous_prices.get(fuel_type)
+            if previous is None or price is None or previous == price:
+                continue
+            change = price - previous
+            change_percent = change / previous * 100 if previous else None
+            if (
+                change_percent is not None
+                and abs(change_percent) <= self.price_change_threshold
+            ):
+                continue
+            self._price_changes.append({
+                "source": src_id,
+                "station_id": station_id,
+                "name": station.name,
+                "fuel_type": fuel_type,
+                "previous": previous,
+                "price": price,
+                "change": round(change, 4),
+                "change_percent": (
+                    round(change_percent, 2) if change_percent is not None else None
+                ),
+            })
+
+    def station_changed(self, source: str, station_id: str) -> bool:
+        """Return if a station changed price during the last update."""
+        if self.changed_stations is None:
+            return True
+        return (source, station_id) in self.changed_stations
+
+    def source_stale(self, source: str) -> bool:
+        """Return if a data source is serving stations from an earlier update."""
+        state = self.source_states.get(source)
+        return state is not None and state.stale
 
-    async def _async_update_data(self):
-        """Fetch and update data from the API."""
+    def cheapest_stations(self, area: dict, fuel_type: str, count: int) -> list[dict]:
+        """Return the cheapest stations of an area, computed once per update."""
+        key = (area[CONF_NAME], fuel_type, count)
+        if key not in self._cheapest:
+            self._cheapest[key] = self.index.cheapest(
+                (area[CONF_LATITUDE], area[CONF_LONGITUDE]),
+                area[CONF_RADIUS],
+                fuel_type,
+                count
+            )
+        return self._cheapest[key]
+
+    def _next_interval(self) -> timedelta:
+        """Return the time until the next data source is due."""
+        next_run = min(
+            (s.next_run for s in self.schedules.values()),
+            default=dt_util.utcnow() + timedelta(days=1)
+        )
+        return max(next_run - dt_util.utcnow(), MIN_TICK)
+
+    async def async_force_refresh(self) -> None:
+        """Refresh every data source now unless its circuit is open."""
+        now = dt_util.utcnow()
+        for src_id, schedule in self.schedules.items():
+            if not self.source_states[src_id].circuit_open(now):
+                schedule.next_run = now
+        await self.async_refresh()
+
+    def async_update_listeners(self) -> None:
+        """Update all listeners and record the time spent writing states."""
+        super().async_update_listeners()
+        self.metrics.flush_render()
+
+    def _restore_last_good(self, src_id: str) -> None:
+        """Put back any station a failed update dropped from a source cache."""
+        source = self.api.configured_sources[src_id]
+        if source.location_cache is None:
+            source.location_cache = {}
+        for station_id, station in self.source_states[src_id].last_good.items():
+            source.location_cache.setdefault(station_id, station)
+
+    async def _async_update_source(self, src_id: str) -> bool:
+        """Update a single data source and publish its stations."""
+        from pyfuelprices.sources import UpdateFailedError
+
+        source = self.api.configured_sources[src_id]
+        schedule = self.schedules[src_id]
+        state = self.source_states[src_id]
+        was_stale = state.stale
+        schedule.next_run = dt_util.utcnow() + schedule.interval
+        error = None
         try:
-            async with async_timeout.timeout(240):
-                return await self.api.update()
+            # The timeout only starts once a concurrency slot is free.
+            async with self._semaphore:
+                with self.metrics.time_fetch(src_id):
+                    async with async_timeout.timeout(schedule.timeout):
+                        await source.update(areas=self.api.configured_areas, force=True)
         except TimeoutError as err:
             _LOGGER.exception(
-                "Timeout updating fuel price data, will retry later: %s", err)
-        except TypeError as err:
+                "Timeout updating %s, will retry later: %s", src_id, err)
+            error = f"Timeout after {schedule.timeout} seconds"
+        except (ValueError, TypeError) as err:
             _LOGGER.exception(
-                "Error updating fuel price data, will retry later: %s", err)
+                "Error updating %s, will retry later: %s", src_id, err)
+            error = str(err)
         except UpdateFailedError as err:
             _LOGGER.exception(
-                "Error communicating with a service %s", err.status, exc_info=err)
-        except UpdateExceptionGroup as err:
-            for e, v in err.failed_providers.items():
-                _LOGGER.exception(
-                    "Error communicating with service %s - %s", e, v, exc_info=v
-                )
+                "Error communicating with service %s - %s", src_id, err.status, exc_info=err)
+            error = f"Service returned {err.status}"
         except Exception as err:
-            raise UpdateFailed(f"Error communicating with API {err}") from err
+            _LOGGER.exception("Error communicating with %s: %s", src_id, err)
+            error = str(err) or type(err).__name__
+        now = dt_util.utcnow()
+        if error is None:
+            state.last_success = now
+            state.last_error = None
+            state.failures = 0
+            state.circuit_open_until = None
+            state.last_good = dict(source.location_cache or {})
+        else:
+            # Keep serving the last good stations and retry with a backoff.
+            state.last_failure = now
+            state.last_error = error
+            state.failures += 1
+            self._restore_last_good(src_id)
+            retry = min(RETRY_BACKOFF * 2 ** (state.failures - 1), schedule.interval)
+            if state.failures >= CIRCUIT_THRESHOLD:
+                state.circuit_open_until = now + max(retry, CIRCUIT_COOLDOWN)
+                retry = state.circuit_open_until - now
+                _LOGGER.warning(
+                    "%s failed %s times in a row, not calling it again until %s",
+                    src_id, state.failures, state.circuit_open_until)
+            schedule.next_run = now + max(retry, MIN_TICK)
+            _LOGGER.debug("Retrying %s at %s after %s failures",
+                          src_id, schedule.next_run, state.failures)
+        self.metrics.source(src_id).stations = len(source.location_cache or {})
+        # Publish this source straight away rather than waiting for slower ones.
+        self.index.refresh()
+        self.catalog.update(src_id)
+        _LOGGER.debug("Clearing response cache %s", self.response_cache.stats)
+        self.response_cache.clear()
+        self._cheapest.clear()
+        first_update = src_id not in self._fingerprints
+        price_changed = self._update_fingerprints(src_id)
+        self.changed_stations = set(price_changed)
+        if state.stale != was_stale:
+            # Every station of the source needs to show its new stale flag.
+            self.changed_stations.update(
+                (src_id, station_id) for station_id in self._fingerprints[src_id])
+        if error is None and schedule.tracker is not None:
+            # The first update reports every station as changed, so only
+            # learn from updates that follow a previous successful one.
+            # Stations only redrawn for their stale flag did not change price.
+            if not first_update and schedule.last_run is not None:
+                schedule.tracker.record(schedule.last_run, now, len(price_changed))
+                self._volatility_store.async_delay_save(
+                    self._volatility_to_save, VOLATILITY_SAVE_DELAY)
+            schedule.last_run = now
+            schedule.next_run = now + schedule.tracker.interval(now, schedule.interval)
+            _LOGGER.debug("Next update of %s due at %s", src_id, schedule.next_run)
+        if error is None and self.history.enabled:
+            for _, station_id in price_changed:
+                self.history.record(
+                    src_id, station_id, source.location_cache[station_id], now)
+            self.history.prune(src_id, self._fingerprints[src_id])
+            if len(price_changed) > 0:
+                self._history_store.async_delay_save(
+                    self.history.as_dict, HISTORY_SAVE_DELAY)
+        if len(self.changed_stations) > 0:
+            self.store.async_schedule_save()
+            self.async_update_listeners()
+        return error is None
+
+    async def _async_update_data(self) -> dict[str, SourceState]:
+        """Fetch and update data from every data source that is due."""
+        self._price_changes = []
+        now = dt_util.utcnow()
+        due = [
+            src_id for src_id, schedule in self.schedules.items()
+            if schedule.next_run <= now
+        ]
+        if len(due) > 0:
+            _LOGGER.debug("Updating data sources %s", due)
+            results = await asyncio.gather(
+                *(self._async_update_source(src_id) for src_id in due)
+            )
+            self.update_interval = self._next_interval()
+            if not any(results) and not any(
+                len(source.location_cache or {}) > 0
+                for source in self.api.configured_sources.values()
+            ):
+                raise UpdateFailed("Error communicating with every data source")
+        # Listeners were notified as each source finished, unless this refresh
+        # recovers from a failure and every entity needs to become available.
+        self.changed_stations = None if not self.last_update_success else set()
+        self.update_interval = self._next_interval()
+        self.first_refresh_done = True
+        if self._price_changes:
+            # One event per refresh however many data sources were updated.
+            self.hass.bus.async_fire(EVENT_PRICE_CHANGED, {
+                "entry_id": self.name,
+                "changes": self._price_changes,
+            })
+            self._price_changes = []
+        return self.source_states
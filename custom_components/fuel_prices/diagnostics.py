@@ -0,0 +1,61 @@
+"""Diagnostics support for Fuel Prices."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import (
+    CONF_API_KEY,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_PASSWORD,
+    CONF_TOKEN,
+    CONF_USERNAME,
+)
+from homeassistant.core import HomeAssistant
+
+from . import FuelPricesConfigEntry
+from .const import CONF_SOURCES
+
+# The data source settings hold provider credentials such as user ids.
+TO_REDACT = {
+    CONF_API_KEY,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_PASSWORD,
+    CONF_SOURCES,
+    CONF_TOKEN,
+    CONF_USERNAME,
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: FuelPricesConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data.coordinator
+    metrics = coordinator.metrics.as_dict()
+    sources = {}
+    for src_id, state in coordinator.source_states.items():
+        schedule = coordinator.schedules[src_id]
+        sources[src_id] = {
+            **state.as_dict(),
+            "interval": schedule.interval,
+            "timeout": schedule.timeout,
+            "next_run": schedule.next_run,
+            "metrics": metrics["sources"].get(src_id),
+        }
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "last_update_success": coordinator.last_update_success,
+        "sources": sources,
+        "services": metrics["services"],
+        "entity_render": metrics["entity_render"],
+        "catalog": coordinator.catalog.as_dict(),
+        "response_cache": coordinator.response_cache.stats,
+        "http_cache": (
+            entry.runtime_data.http_cache.stats
+            if entry.runtime_data.http_cache is not None else None
+        ),
+    }
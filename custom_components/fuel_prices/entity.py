@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from homeassistant.helpers.entity import EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.config_entries import ConfigEntry
 
@@ -26,18 +27,81 @@ class FuelStationEntity(FuelPriceEntity, CoordinatorEntity):
         self.coordinator: FuelPricesCoordinator = coordinator
         self._fuel_station_id = fuel_station_id
         self._entity_id = entity_id
-        self._fuel_station_source = str(source).lower()
+        # Unknown for stations restored from the entity registry.
+        self._fuel_station_source = None if source is None else str(source).lower()
         self.area = area
         self.state_value = state_value
 
     @property
     def _fuel_station(self):
         """Return the fuel station."""
-        return self.coordinator.api.configured_sources[
-            self._fuel_station_source
-        ].location_cache[self._fuel_station_id]
+        sources = self.coordinator.api.configured_sources
+        if self._fuel_station_source is None:
+            for src_id, source in sources.items():
+                if self._fuel_station_id in (source.location_cache or {}):
+                    self._fuel_station_source = src_id
+                    break
+            else:
+                raise KeyError(self._fuel_station_id)
+        return (sources[self._fuel_station_source].location_cache or {})[
+            self._fuel_station_id
+        ]
 
     @property
     def unique_id(self) -> str | None:
         """Return unique ID."""
         return f"fuelprices_{self._fuel_station_id}_{self._entity_id}"
+
+
+class CheapestStationEntity(FuelPriceEntity, CoordinatorEntity):
+    """Represents the station at a given price rank of an area."""
+
+    def __init__(
+        self, coordinator: FuelPricesCoordinator, area: dict, fuel_type: str, rank: int, count: int, config: ConfigEntry
+    ) -> None:
+        """Initialize."""
+        self.config = config
+        super().__init__(coordinator)
+        self.coordinator: FuelPricesCoordinator = coordinator
+        self.area = area
+        self.fuel_type = fuel_type
+        self.rank = rank
+        self.count = count
+
+    @property
+    def _station(self) -> dict | None:
+        """Return the station at this rank, if there is one."""
+        stations = self.coordinator.cheapest_stations(
+            self.area, self.fuel_type, self.count)
+        if len(stations) < self.rank:
+            return None
+        return stations[self.rank - 1]
+
+    @property
+    def unique_id(self) -> str | None:
+        """Return unique ID."""
+        return (
+            f"fuelprices_{self.config.entry_id}_{self.area['name']}_"
+            f"{self.fuel_type}_cheapest_{self.rank}"
+        )
+
+
+class MetricEntity(FuelPriceEntity, CoordinatorEntity):
+    """Represents a performance metric."""
+
+    def __init__(
+        self, coordinator: FuelPricesCoordinator, description: EntityDescription, config: ConfigEntry, source: str | None = None
+    ) -> None:
+        """Initialize."""
+        self.config = config
+        super().__init__(coordinator)
+        self.coordinator: FuelPricesCoordinator = coordinator
+        self.entity_description = description
+        self.source = source
+
+    @property
+    def unique_id(self) -> str | None:
+        """Return unique ID."""
+        if self.source is None:
+            return f"fuelprices_{self.config.entry_id}_{self.entity_description.key}"
+        return f"fuelprices_{self.config.entry_id}_{self.source}_{self.entity_description.key}"
@@ -0,0 +1,301 @@
+"""Compact history of the recent prices of every station."""
+
+from __future__ import annotations
+
+import base64
+import logging
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from pyfuelprices.fuel_locations import FuelLocation
+
+_LOGGER = logging.getLogger(__name__)
+
+# Price changes kept for each fuel of a station, the oldest are overwritten.
+CAPACITY = 256
+DAY = 86400
+
+
+@dataclass
+class PriceStats:
+    """Trend of a price over the history window."""
+
+    minimum: float
+    maximum: float
+    average: float
+    change_24h: float | None
+    # Whole days the current price has been the lowest.
+    lowest_in_days: int
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stats."""
+        return asdict(self)
+
+
+class PriceSeries:
+    """Ring buffer of the price changes of a single fuel at a station."""
+
+    __slots__ = ("prices", "start", "times")
+
+    def __init__(self) -> None:
+        """Init an empty series."""
+        # Seconds since the epoch and the price from then on.
+        self.times = array("I")
+        self.prices = array("d")
+        # Position of the oldest change once the buffer has wrapped.
+        self.start = 0
+
+    def __len__(self) -> int:
+        """Return the number of price changes kept."""
+        return len(self.times)
+
+    def append(self, timestamp: int, price: float) -> bool:
+        """Add a price, returning if it differs from the last one."""
+        size = len(self.times)
+        if size > 0 and self.prices[(self.start - 1) % size] == price:
+            return False
+        if size < CAPACITY:
+            self.times.append(timestamp)
+            self.prices.append(price)
+        else:
+            self.times[self.start] = timestamp
+            self.prices[self.start] = price
+            self.start = (self.start + 1) % size
+        return True
+
+    def samples(self, reverse: bool = False) -> Iterator[tuple[int, float]]:
+        """Return the price changes, oldest first."""
+        size = len(self.times)
+        positions = range(size - 1, -1, -1) if reverse else range(size)
+        for i in positions:
+            j = (self.start + i) % size
+            yield self.times[j], self.prices[j]
+
+    def price_at(self, timestamp: int) -> float | None:
+        """Return the price at a given time, if it is known."""
+        for time, price in self.samples(reverse=True):
+            if time <= timestamp:
+                return price
+        return None
+
+    def stats(self, now: int, window: int) -> PriceStats | None:
+        """Return the trend of the price over the last window seconds."""
+        if len(self.times) == 0:
+            return None
+        times, prices, size = self.times, self.prices, len(self.times)
+        window_start = now - window
+        day_start = now - DAY
+        current = prices[(self.start - 1) % size]
+        minimum = maximum = current
+        weighted = 0.0
+        covered = 0
+        lower_until = None
+        previous = None
+        first = now
+        end = now
+        # Walk back from the latest change, each price lasts until the next.
+        for i in range(size - 1, -1, -1):
+            j = (self.start + i) % size
+            time, price = times[j], prices[j]
+            duration = end - max(time, window_start)
+            if duration > 0:
+                weighted += price * duration
+                covered += duration
+            if price < minimum:
+                minimum = price
+            elif price > maximum:
+                maximum = price
+            if lower_until is None and price < current:
+                lower_until = end
+            if previous is None and time <= day_start:
+                previous = price
+            first = max(time, window_start)
+            end = time
+            if time <= window_start:
+                break
+        if previous is None and window_start > day_start:
+            previous = self.price_at(day_start)
+        return PriceStats(
+            minimum=minimum,
+            maximum=maximum,
+            average=round(weighted / covered, 4) if covered else current,
+            change_24h=(
+                round(current - previous, 4) if previous is not None else None
+            ),
+            lowest_in_days=(now - (lower_until or first)) // DAY,
+        )
+
+    def since(self, timestamp: int) -> tuple[array, array]:
+        """Return the changes since a time, and the price in effect then."""
+        times, prices = self.times, self.prices
+        if self.start:
+            times = times[self.start:] + times[:self.start]
+            prices = prices[self.start:] + prices[:self.start]
+        keep = max(bisect_right(times, timestamp) - 1, 0)
+        if keep == 0:
+            return times, prices
+        return times[keep:], prices[keep:]
+
+    @classmethod
+    def from_arrays(cls, times: array, prices: array) -> PriceSeries:
+        """Build a series from its changes, oldest first."""
+        series = cls()
+        if len(times) > CAPACITY:
+            times, prices = times[-CAPACITY:], prices[-CAPACITY:]
+        series.times = times
+        series.prices = prices
+        return series
+
+
+class PriceHistory:
+    """Price changes of every station over the last few days."""
+
+    def __init__(self, days: int) -> None:
+        """Init the history."""
+        self.days = int(days)
+        # Series by source, station and fuel type.
+        self._series: dict[str, dict[str, dict[str, PriceSeries]]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Return if price history is kept."""
+        return self.days > 0
+
+    @property
+    def window(self) -> int:
+        """Return the length of the history in seconds."""
+        return self.days * DAY
+
+    def record(
+        self, src_id: str, station_id: str, station: FuelLocation, now: datetime
+    ) -> None:
+        """Add the current prices of a station."""
+        timestamp = int(now.timestamp())
+        fuels = self._series.setdefault(src_id, {}).setdefault(station_id, {})
+        for fuel in station.available_fuels:
+            if fuel.cost is None:
+                continue
+            if fuel.fuel_type not in fuels:
+                fuels[fuel.fuel_type] = PriceSeries()
+            fuels[fuel.fuel_type].append(timestamp, float(fuel.cost))
+
+    def prune(self, src_id: str, station_ids: dict | set) -> None:
+        """Forget the stations no longer offered by a source."""
+        stations = self._series.get(src_id, {})
+        for station_id in [s for s in stations if s not in station_ids]:
+            stations.pop(station_id)
+
+    def _find(self, station_id: str, src_id: str | None) -> tuple[str, dict[str, PriceSeries]] | None:
+        """Return the source and series of a station."""
+        for source, stations in self._series.items():
+            if src_id in (None, "", source) and station_id in stations:
+                return source, stations[station_id]
+        return None
+
+    def stats(
+        self, src_id: str | None, station_id: str, fuel_type: str
+    ) -> PriceStats | None:
+        """Return the trend of the price of a fuel at a station."""
+        found = self._find(station_id, src_id)
+        if found is None or fuel_type not in found[1]:
+            return None
+        return found[1][fuel_type].stats(
+            int(dt_util.utcnow().timestamp()), self.window)
+
+    def station_history(
+        self,
+        station_id: str,
+        src_id: str | None = None,
+        fuel_type: str | None = None,
+        days: int | None = None,
+    ) -> dict[str, Any]:
+        """Return the price changes and trend of a station."""
+        found = self._find(station_id, src_id)
+        if found is None:
+            return {"station_id": station_id, "source": src_id, "fuels": {}}
+        source, fuels = found
+        now = int(dt_util.utcnow().timestamp())
+        window = min(int(days), self.days) * DAY if days else self.window
+        window_start = now - window
+        result = {}
+        for fuel, series in fuels.items():
+            if fuel_type not in (None, "", fuel):
+                continue
+            samples = [
+                (time, price) for time, price in series.samples()
+                if time >= window_start
+            ]
+            before = series.price_at(window_start)
+            if before is not None and (not samples or samples[0][0] > window_start):
+                # Start with the price in effect when the window begins.
+                samples.insert(0, (window_start, before))
+            prices = [
+                {"time": dt_util.utc_from_timestamp(time).isoformat(), "price": price}
+                for time, price in samples
+            ]
+            stats = series.stats(now, window)
+            result[fuel] = {
+                "prices": prices,
+                "stats": stats.as_dict() if stats is not None else None,
+            }
+        return {"station_id": station_id, "source": source, "fuels": result}
+
+    def load(self, data: dict[str, Any]) -> None:
+        """Restore saved price changes."""
+        restored = 0
+        for src_id, packed in data.get("sources", {}).items():
+            counts = array("I", base64.b64decode(packed["counts"]))
+            times = array("I", base64.b64decode(packed["times"]))
+            prices = array("d", base64.b64decode(packed["prices"]))
+            if not (
+                len(counts) == len(packed["stations"]) == len(packed["fuel_types"])
+                and sum(counts) == len(times) == len(prices)
+            ):
+                _LOGGER.debug("Ignoring the saved prices of %s as they do not match", src_id)
+                continue
+            stations = self._series.setdefault(src_id, {})
+            offset = 0
+            for station_id, fuel_type, count in zip(
+                packed["stations"], packed["fuel_types"], counts, strict=True
+            ):
+                stations.setdefault(station_id, {})[fuel_type] = PriceSeries.from_arrays(
+                    times[offset:offset + count], prices[offset:offset + count])
+                offset += count
+                restored += 1
+        _LOGGER.debug("Restored the price history of %s fuels", restored)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Pack the price changes within the history window of every source."""
+        since = int(dt_util.utcnow().timestamp()) - self.window
+        sources = {}
+        for src_id, stations in self._series.items():
+            # Flat arrays per source rather than an object per series keep
+            # saving thousands of stations cheap.
+            station_ids = []
+            fuel_types = []
+            counts = array("I")
+            times = array("I")
+            prices = array("d")
+            for station_id, fuels in stations.items():
+                for fuel_type, series in fuels.items():
+                    series_times, series_prices = series.since(since)
+                    station_ids.append(station_id)
+                    fuel_types.append(fuel_type)
+                    counts.append(len(series_times))
+                    times += series_times
+                    prices += series_prices
+            sources[src_id] = {
+                "stations": station_ids,
+                "fuel_types": fuel_types,
+                "counts": base64.b64encode(counts.tobytes()).decode(),
+                "times": base64.b64encode(times.tobytes()).decode(),
+                "prices": base64.b64encode(prices.tobytes()).decode(),
+            }
+        return {"sources": sources}
@@ -0,0 +1,190 @@
+"""Conditional request cache for the data source client session."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+import os
+import shutil
+from functools import partial
+from http import HTTPStatus
+from typing import Any
+
+from aiohttp import ClientHandlerType, ClientRequest, ClientResponse, hdrs
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+# Larger bodies are not worth keeping on disk.
+MAX_BODY_SIZE = 32 * 1024 * 1024
+# The least recently used bodies are removed past this total size.
+MAX_CACHE_SIZE = 128 * 1024 * 1024
+# Request headers that can change the body served for the same URL.
+KEY_HEADERS = (
+    hdrs.ACCEPT,
+    hdrs.ACCEPT_LANGUAGE,
+    hdrs.AUTHORIZATION,
+    hdrs.COOKIE,
+)
+
+
+class ConditionalRequestCache:
+    """Client middleware that revalidates GET responses with ETag and Last-Modified."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Init the cache."""
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.http"
+        )
+        self._body_dir = hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry_id}.http_bodies")
+        # Validators of every cached response, least recently used first.
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def _body_path(self, key: str) -> str:
+        """Return the file holding a cached body."""
+        return os.path.join(self._body_dir, key)
+
+    def _read_body(self, key: str) -> bytes | None:
+        """Read a cached body from disk."""
+        try:
+            with open(self._body_path(key), "rb") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def _write_body(self, key: str, body: bytes, evicted: list[str]) -> None:
+        """Write a body to disk and delete the evicted ones."""
+        os.makedirs(self._body_dir, exist_ok=True)
+        with open(self._body_path(key), "wb") as file:
+            file.write(body)
+        for evicted_key in evicted:
+            with contextlib.suppress(OSError):
+                os.remove(self._body_path(evicted_key))
+
+    async def _async_entries(self) -> dict[str, dict[str, Any]]:
+        """Return the validators of every cached response, loading them once."""
+        if self._entries is None:
+            self._entries = await self._store.async_load() or {}
+        return self._entries
+
+    def _evict(self, entries: dict[str, dict[str, Any]]) -> list[str]:
+        """Forget the least recently used bodies past the size of the cache."""
+        total = sum(entry.get("size", 0) for entry in entries.values())
+        evicted = []
+        for key in list(entries):
+            if total <= MAX_CACHE_SIZE:
+                break
+            total -= entries.pop(key).get("size", 0)
+            evicted.append(key)
+        return evicted
+
+    @staticmethod
+    def _key(request: ClientRequest) -> str:
+        """Return the cache key of a request."""
+        key = hashlib.sha256(f"{request.method} {request.url}".encode())
+        for header in KEY_HEADERS:
+            for value in request.headers.getall(header, ()):
+                key.update(f"\n{header}: {value}".encode())
+        return key.hexdigest()
+
+    async def __call__(
+        self, request: ClientRequest, handler: ClientHandlerType
+    ) -> ClientResponse:
+        """Send a conditional request and serve the cached body on a 304."""
+        if request.method != hdrs.METH_GET:
+            return await handler(request)
+        entries = await self._async_entries()
+        key = self._key(request)
+        entry = entries.get(key)
+        if entry is not None:
+            if entry.get("etag"):
+                request.headers.setdefault(hdrs.IF_NONE_MATCH, entry["etag"])
+            if entry.get("last_modified"):
+                request.headers.setdefault(hdrs.IF_MODIFIED_SINCE, entry["last_modified"])
+        response = await handler(request)
+        if response.status == HTTPStatus.NOT_MODIFIED and entry is not None:
+            body = await self._hass.async_add_executor_job(self._read_body, key)
+            if body is not None:
+                self.hits += 1
+                self.bytes_saved += len(body)
+                # Move to the end as the most recently used.
+                entries[key] = entries.pop(key)
+                self._store.async_delay_save(lambda: entries, SAVE_DELAY)
+                _LOGGER.debug("Serving %s bytes from cache for %s", len(body), request.url)
+                await self._replay(response, entry, body)
+                return response
+            # The body is gone, stop revalidating it.
+            entries.pop(key, None)
+        if response.status != HTTPStatus.OK:
+            return response
+        self.misses += 1
+        etag = response.headers.get(hdrs.ETAG)
+        last_modified = response.headers.get(hdrs.LAST_MODIFIED)
+        if etag is None and last_modified is None:
+            return response
+        body = await response.read()
+        if len(body) > MAX_BODY_SIZE:
+            return response
+        entries.pop(key, None)
+        entries[key] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_type": response.headers.get(hdrs.CONTENT_TYPE),
+            "size": len(body),
+        }
+        evicted = self._evict(entries)
+        await self._hass.async_add_executor_job(self._write_body, key, body, evicted)
+        self._store.async_delay_save(lambda: entries, SAVE_DELAY)
+        return response
+
+    @staticmethod
+    async def _replay(
+        response: ClientResponse, entry: dict[str, Any], body: bytes
+    ) -> None:
+        """Turn a 304 response into the cached 200 response."""
+        # Drain the empty 304 body so the connection is released.
+        await response.read()
+        headers = CIMultiDict(response.headers)
+        # The cached body is stored decoded, so drop the transfer headers.
+        headers.popall(hdrs.CONTENT_ENCODING, None)
+        headers.popall(hdrs.TRANSFER_ENCODING, None)
+        headers[hdrs.CONTENT_LENGTH] = str(len(body))
+        if entry.get("content_type"):
+            headers[hdrs.CONTENT_TYPE] = entry["content_type"]
+        response.status = HTTPStatus.OK
+        response.reason = "OK"
+        # A body is only read from the connection once, after that read, text
+        # and json decode the stored one, so swap in the cached body. The
+        # headers are cached on first access, drop them to serve the new ones.
+        response._headers = CIMultiDictProxy(headers)
+        response._cache.pop("headers", None)
+        response._body = body
+
+    async def async_remove(self) -> None:
+        """Delete every cached response."""
+        await self._store.async_remove()
+        await self._hass.async_add_executor_job(
+            partial(shutil.rmtree, self._body_dir, ignore_errors=True))
+        self._entries = {}
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the cache counters."""
+        return {
+            "entries": len(self._entries or {}),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes_saved": self.bytes_saved,
+        }
@@ -0,0 +1,171 @@
+"""Performance metrics of data source updates, services and entities."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from aiohttp import ClientHandlerType, ClientRequest, ClientResponse
+
+# Number of samples kept for each percentile.
+SAMPLE_SIZE = 100
+
+# The data source being updated by the current task, used to attribute requests.
+current_source: ContextVar[str | None] = ContextVar(
+    "fuel_prices_current_source", default=None
+)
+
+
+class LatencyStats:
+    """Rolling window of durations in seconds."""
+
+    def __init__(self, size: int = SAMPLE_SIZE) -> None:
+        """Init the window."""
+        self._samples: deque[float] = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, duration: float) -> None:
+        """Record a duration."""
+        self._samples.append(duration)
+        self.count += 1
+
+    def percentile(self, percent: float) -> float | None:
+        """Return a percentile of the window using the nearest rank."""
+        if len(self._samples) == 0:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(round(percent / 100 * len(ordered)) - 1, 0)
+        return ordered[min(rank, len(ordered) - 1)]
+
+    @property
+    def last(self) -> float | None:
+        """Return the latest duration."""
+        return self._samples[-1] if len(self._samples) > 0 else None
+
+    def as_dict(self) -> dict:
+        """Return the summary in milliseconds."""
+
+        def to_ms(value: float | None) -> float | None:
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "count": self.count,
+            "last_ms": to_ms(self.last),
+            "p50_ms": to_ms(self.percentile(50)),
+            "p95_ms": to_ms(self.percentile(95)),
+        }
+
+
+@dataclass
+class SourceMetrics:
+    """Metrics of a single data source."""
+
+    fetch: LatencyStats = field(default_factory=LatencyStats)
+    http: LatencyStats = field(default_factory=LatencyStats)
+    parse: LatencyStats = field(default_factory=LatencyStats)
+    requests: int = 0
+    response_bytes: int = 0
+    last_response_bytes: int = 0
+    stations: int = 0
+    # Request time and bytes of the update in progress.
+    _pending_http: float = 0
+    _pending_bytes: int = 0
+
+    def as_dict(self) -> dict:
+        """Return the metrics."""
+        return {
+            "fetch": self.fetch.as_dict(),
+            "http": self.http.as_dict(),
+            "parse": self.parse.as_dict(),
+            "requests": self.requests,
+            "response_bytes": self.response_bytes,
+            "last_response_bytes": self.last_response_bytes,
+            "stations": self.stations,
+        }
+
+
+class Metrics:
+    """Collect performance metrics of an integration entry."""
+
+    def __init__(self) -> None:
+        """Init the metrics."""
+        self.sources: dict[str, SourceMetrics] = {}
+        self.services: dict[str, LatencyStats] = {}
+        self.render = LatencyStats()
+        self._render_pending = 0.0
+
+    def source(self, src_id: str) -> SourceMetrics:
+        """Return the metrics of a data source."""
+        return self.sources.setdefault(src_id, SourceMetrics())
+
+    @contextmanager
+    def time_fetch(self, src_id: str) -> Iterator[None]:
+        """Time a data source update and attribute its requests to it."""
+        metrics = self.source(src_id)
+        metrics._pending_http = 0
+        metrics._pending_bytes = 0
+        token = current_source.set(src_id)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            current_source.reset(token)
+            metrics.fetch.add(duration)
+            metrics.http.add(metrics._pending_http)
+            # Whatever was not spent waiting on the network was spent parsing.
+            metrics.parse.add(max(duration - metrics._pending_http, 0))
+            metrics.last_response_bytes = metrics._pending_bytes
+
+    @contextmanager
+    def time_service(self, service: str) -> Iterator[None]:
+        """Time a service call."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.services.setdefault(service, LatencyStats()).add(
+                time.perf_counter() - start)
+
+    def add_render(self, duration: float) -> None:
+        """Add the time spent writing a single entity state."""
+        self._render_pending += duration
+
+    def flush_render(self) -> None:
+        """Record the entity state writes of a refresh as one sample."""
+        if self._render_pending > 0:
+            self.render.add(self._render_pending)
+            self._render_pending = 0.0
+
+    async def request_middleware(
+        self, request: ClientRequest, handler: ClientHandlerType
+    ) -> ClientResponse:
+        """Client middleware measuring the requests of the current data source."""
+        src_id = current_source.get()
+        if src_id is None:
+            return await handler(request)
+        start = time.perf_counter()
+        response = await handler(request)
+        body = await response.read()
+        metrics = self.source(src_id)
+        metrics.requests += 1
+        metrics.response_bytes += len(body)
+        metrics._pending_bytes += len(body)
+        metrics._pending_http += time.perf_counter() - start
+        return response
+
+    def as_dict(self) -> dict:
+        """Return every metric."""
+        return {
+            "sources": {
+                src_id: metrics.as_dict() for src_id, metrics in self.sources.items()
+            },
+            "services": {
+                service: stats.as_dict() for service, stats in self.services.items()
+            },
+            "entity_render": self.render.as_dict(),
+        }
@@ -3,103 +3,530 @@
 from __future__ import annotations
 
 
+import heapq
 import logging
+import time
 
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
 from typing import Any
 from datetime import timedelta
 
-from homeassistant.components.sensor import SensorEntity
-from homeassistant.components.sensor.const import SensorDeviceClass
-from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE, CONF_RADIUS, CONF_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.components.sensor import (
+    RestoreSensor,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorExtraStoredData,
+)
+from homeassistant.components.sensor.const import (
+    ATTR_STATE_CLASS,
+    SensorDeviceClass,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
+    ATTR_FRIENDLY_NAME,
+    ATTR_ICON,
+    ATTR_UNIT_OF_MEASUREMENT,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_RADIUS,
+    CONF_NAME,
+    EntityCategory,
+    Platform,
+    UnitOfInformation,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from pyfuelprices.const import PROP_FUEL_LOCATION_SOURCE
 from . import FuelPricesConfigEntry
-from .const import CONF_STATE_VALUE
-from .entity import FuelStationEntity
+from .const import (
+    DOMAIN,
+    CONF_STATE_VALUE,
+    CONF_ATTRIBUTE_PROFILE,
+    ATTRIBUTE_PROFILE_FULL,
+    ATTRIBUTE_PROFILE_PRICES,
+    CONF_CHEAPEST_FUEL_TYPES,
+    CONF_CHEAPEST_COUNT,
+    DEFAULT_CHEAPEST_COUNT,
+    CONF_STATION_FUEL_TYPES,
+    CONF_STATION_BRANDS,
+    CONF_MAX_STATIONS,
+    CONF_STATION_ORDER,
+    CONF_EXCLUDE_EV_CHARGERS,
+    STATION_ORDER_CHEAPEST,
+    STATION_ORDER_NEAREST,
+    DEFAULT_MAX_STATIONS,
+)
+from .entity import FuelStationEntity, CheapestStationEntity, MetricEntity
+from .metrics import Metrics
 
 _LOGGER = logging.getLogger(__name__)
 
 SCAN_INTERVAL = timedelta(minutes=1)
 
+# Suffix of the unique ID of station sensors.
+STATION_ENTITY_ID = "devicetracker"
+ICON_FUEL_STATION = "mdi:gas-station"
+ICON_EV_CHARGER = "mdi:battery-charging"
+PRICE_TREND_ATTRIBUTES = (
+    "price_min",
+    "price_max",
+    "price_average",
+    "price_change_24h",
+    "lowest_in_days",
+)
+# The trend depends on the time as well as the prices, so it is redrawn at
+# least this often while the price stays the same.
+PRICE_TREND_REFRESH = timedelta(hours=1)
+# Attributes Home Assistant sets itself, not restored with the station data.
+RESTORED_ATTRIBUTES_IGNORED = frozenset({
+    ATTR_DEVICE_CLASS,
+    ATTR_FRIENDLY_NAME,
+    ATTR_ICON,
+    ATTR_STATE_CLASS,
+    ATTR_UNIT_OF_MEASUREMENT,
+})
+
+# Prefix of the fuel types of electric vehicle charge points.
+EV_FUEL_PREFIX = "EV"
+
+
+def _is_ev_charger(station: dict) -> bool:
+    """Return if a station only offers electric vehicle charging."""
+    fuels = station["available_fuels"]
+    return len(fuels) > 0 and all(
+        fuel_type.upper().startswith(EV_FUEL_PREFIX) for fuel_type in fuels
+    )
+
+
+def _filter_stations(area: dict, stations: list[dict]) -> list[dict]:
+    """Apply the station filters of an area to the stations found within it."""
+    fuel_types = area.get(CONF_STATION_FUEL_TYPES, [])
+    brands = {brand.lower() for brand in area.get(CONF_STATION_BRANDS, [])}
+    if area.get(CONF_EXCLUDE_EV_CHARGERS, False):
+        stations = [station for station in stations if not _is_ev_charger(station)]
+    if len(fuel_types) > 0:
+        stations = [
+            station for station in stations
+            if any(fuel_type in station["available_fuels"] for fuel_type in fuel_types)
+        ]
+    if len(brands) > 0:
+        stations = [
+            station for station in stations
+            if (station["brand"] or "").lower() in brands
+        ]
+    max_stations = int(area.get(CONF_MAX_STATIONS, DEFAULT_MAX_STATIONS))
+    if max_stations <= 0 or len(stations) <= max_stations:
+        return stations
+    if area.get(CONF_STATION_ORDER, STATION_ORDER_NEAREST) == STATION_ORDER_CHEAPEST:
+
+        def order(station: dict) -> tuple[float, float]:
+            costs = [
+                cost for fuel_type, cost in station["available_fuels"].items()
+                if cost > 0 and (len(fuel_types) == 0 or fuel_type in fuel_types)
+            ]
+            return (min(costs) if costs else float("inf"), station["distance"])
+    else:
+
+        def order(station: dict) -> tuple[float, float]:
+            return (station["distance"], 0)
+    return heapq.nsmallest(max_stations, stations, key=order)
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: FuelPricesConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Integration platform creation."""
-    entities = []
-    found_entities = []
+    coordinator = entry.runtime_data.coordinator
+    trackers: dict[str, FuelStationTracker] = {}
     state_value = entry.options.get(
         CONF_STATE_VALUE, entry.data.get(CONF_STATE_VALUE, "name")
     )
-    for area in entry.runtime_data.areas:
-        _LOGGER.debug("Registering entities for area %s", area[CONF_NAME])
-        for station in await entry.runtime_data.coordinator.api.find_fuel_locations_from_point(
-            coordinates=(area[CONF_LATITUDE], area[CONF_LONGITUDE]),
-            radius=area[CONF_RADIUS],
+    attribute_profile = entry.options.get(
+        CONF_ATTRIBUTE_PROFILE, entry.data.get(CONF_ATTRIBUTE_PROFILE, ATTRIBUTE_PROFILE_FULL)
+    )
+
+    def build_tracker(
+        station_id: str, source: str | None, area: str | None
+    ) -> FuelStationTracker:
+        """Create the sensor of a station."""
+        tracker = FuelStationTracker(
+            coordinator=coordinator,
+            fuel_station_id=station_id,
+            entity_id=STATION_ENTITY_ID,
+            source=source,
+            area=area,
+            state_value=state_value,
+            config=entry,
+            attribute_profile=attribute_profile
+        )
+        trackers[station_id] = tracker
+        return tracker
+
+    async def async_discover_stations(cached_only: bool) -> list[FuelStationTracker]:
+        """Create sensors for the stations of every area without one yet."""
+        new = []
+        for area in entry.runtime_data.areas:
+            _LOGGER.debug("Registering entities for area %s", area[CONF_NAME])
+            stations = await coordinator.index.find_fuel_locations_from_point(
+                coordinates=(area[CONF_LATITUDE], area[CONF_LONGITUDE]),
+                radius=area[CONF_RADIUS],
+                cached_only=cached_only,
+            )
+            for station in _filter_stations(area, stations):
+                if station["id"] not in trackers:
+                    new.append(build_tracker(
+                        station["id"],
+                        station["props"][PROP_FUEL_LOCATION_SOURCE],
+                        area[CONF_NAME],
+                    ))
+        return new
+
+    # Nothing is fetched during setup, the sources are searched once the
+    # background refresh has updated them.
+    entities = await async_discover_stations(cached_only=True)
+    if not any(
+        len(source.location_cache or {}) > 0
+        for source in coordinator.api.configured_sources.values()
+    ):
+        # Nothing cached yet, bring back the station sensors of the last run
+        # with their restored state until the first refresh completes.
+        for registry_entry in er.async_entries_for_config_entry(
+            er.async_get(hass), entry.entry_id
         ):
-            if station["id"] not in found_entities:
+            station_id = _station_id_from_unique_id(registry_entry.unique_id)
+            if (
+                registry_entry.domain == Platform.SENSOR
+                and station_id is not None
+                and station_id not in trackers
+            ):
+                entities.append(build_tracker(station_id, None, None))
+        _LOGGER.debug("Restored %s station sensors from the entity registry", len(trackers))
+    for area in entry.runtime_data.areas:
+        count = int(area.get(CONF_CHEAPEST_COUNT, DEFAULT_CHEAPEST_COUNT))
+        for fuel_type in area.get(CONF_CHEAPEST_FUEL_TYPES, []):
+            for rank in range(1, count + 1):
                 entities.append(
-                    FuelStationTracker(
-                        coordinator=entry.runtime_data.coordinator,
-                        fuel_station_id=station["id"],
-                        entity_id="devicetracker",
-                        source=station["props"][PROP_FUEL_LOCATION_SOURCE],
-                        area=area[CONF_NAME],
-                        state_value=state_value,
+                    CheapestStationSensor(
+                        coordinator=coordinator,
+                        area=area,
+                        fuel_type=fuel_type,
+                        rank=rank,
+                        count=count,
                         config=entry
                     )
                 )
-                found_entities.append(station["id"])
-    async_add_entities(entities, True)
+    for src_id in coordinator.api.configured_sources:
+        entities.extend(
+            MetricSensor(
+                coordinator=coordinator,
+                description=description,
+                config=entry,
+                source=src_id,
+            )
+            for description in SOURCE_METRICS
+        )
+    entities.extend(
+        MetricSensor(
+            coordinator=coordinator,
+            description=description,
+            config=entry,
+        )
+        for description in (*ENTRY_METRICS, *SERVICE_METRICS)
+    )
+    # Entities are not updated before being added, that would wait for a refresh.
+    async_add_entities(entities)
+
+    discovered = False
+
+    async def async_add_discovered_stations() -> None:
+        """Add the stations found by the first refresh."""
+        try:
+            new = await async_discover_stations(cached_only=False)
+        except ValueError as err:
+            _LOGGER.warning("Unable to discover new stations: %s", err)
+            return
+        if new:
+            _LOGGER.debug("Adding %s station sensors after the first refresh", len(new))
+            async_add_entities(new)
+
+    @callback
+    def async_first_refresh_done() -> None:
+        """Look for new stations once every data source has been updated."""
+        nonlocal discovered
+        if discovered or not coordinator.first_refresh_done:
+            return
+        discovered = True
+        entry.async_create_background_task(
+            hass, async_add_discovered_stations(), f"{DOMAIN}_{entry.entry_id}_discover"
+        )
+
+    entry.async_on_unload(coordinator.async_add_listener(async_first_refresh_done))
+
+
+def _station_id_from_unique_id(unique_id: str) -> str | None:
+    """Return the station ID of a station sensor unique ID."""
+    prefix = "fuelprices_"
+    suffix = f"_{STATION_ENTITY_ID}"
+    if unique_id.startswith(prefix) and unique_id.endswith(suffix):
+        return unique_id[len(prefix):-len(suffix)]
+    return None
+
+
+@dataclass
+class StationSnapshot:
+    """Station data computed once per coordinator refresh."""
+
+    native_value: str | float | None
+    fuels: dict[str, float]
+    name: str | None
+    currency: str | None
+    icon: str
+    attributes: dict[str, Any] | None = None
+
 
+@dataclass
+class FuelStationExtraStoredData(SensorExtraStoredData):
+    """Sensor data kept across restarts, with where to find the station."""
 
-class FuelStationTracker(FuelStationEntity, SensorEntity):
+    source: str | None = None
+    area: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the data."""
+        return {**super().as_dict(), "source": self.source, "area": self.area}
+
+    @classmethod
+    def from_dict(cls, restored: dict[str, Any]) -> FuelStationExtraStoredData | None:
+        """Initialize the stored data from a dict."""
+        data = SensorExtraStoredData.from_dict(restored)
+        if data is None:
+            return None
+        return cls(
+            data.native_value,
+            data.native_unit_of_measurement,
+            restored.get("source"),
+            restored.get("area"),
+        )
+
+
+class FuelStationTracker(FuelStationEntity, RestoreSensor):
     """A fuel station entity."""
 
+    # Change on every update or duplicate the flattened prices.
+    _unrecorded_attributes = frozenset({
+        "available_fuels",
+        "fuel_details",
+        "last_updated",
+        "next_update",
+        "props",
+        *PRICE_TREND_ATTRIBUTES,
+    })
+    _snapshot: StationSnapshot | None = None
+    # State from before a restart, shown until the station is updated.
+    _restored: StationSnapshot | None = None
+    # If the current snapshot was built from the cached station.
+    _live = False
+    # Monotonic time the price trend is due to be worked out again, if shown.
+    _trend_due: float | None = None
+
+    def __init__(
+        self, *args, attribute_profile: str = ATTRIBUTE_PROFILE_FULL, **kwargs
+    ) -> None:
+        """Initialize."""
+        super().__init__(*args, **kwargs)
+        self.attribute_profile = attribute_profile
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the state from before a restart."""
+        await super().async_added_to_hass()
+        last_state = await self.async_get_last_state()
+        last_extra_data = await self.async_get_last_extra_data()
+        if last_state is None or last_extra_data is None:
+            return
+        data = FuelStationExtraStoredData.from_dict(last_extra_data.as_dict())
+        if data is None:
+            return
+        if self._fuel_station_source is None:
+            self._fuel_station_source = data.source
+        if self.area is None:
+            self.area = data.area
+        if self._live:
+            # Already updated from the cached station.
+            return
+        attributes = {
+            key: value for key, value in last_state.attributes.items()
+            if key not in RESTORED_ATTRIBUTES_IGNORED
+        }
+        attributes["stale"] = True
+        self._restored = StationSnapshot(
+            native_value=data.native_value,
+            fuels=attributes.get("available_fuels") or {},
+            name=last_state.attributes.get(ATTR_FRIENDLY_NAME),
+            currency=data.native_unit_of_measurement,
+            icon=last_state.attributes.get(ATTR_ICON, ICON_FUEL_STATION),
+            attributes=attributes,
+        )
+        self._snapshot = None
+
+    @property
+    def extra_restore_state_data(self) -> FuelStationExtraStoredData:
+        """Return the data kept across restarts."""
+        return FuelStationExtraStoredData(
+            self.native_value,
+            self.native_unit_of_measurement,
+            self._fuel_station_source,
+            self.area,
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return if the station is cached, or restored and not updated yet."""
+        if not super().available:
+            return False
+        try:
+            self._fuel_station
+        except KeyError:
+            return self._restored is not None and not self._source_updated
+        return True
+
+    @property
+    def _source_updated(self) -> bool:
+        """Return if the source of the station has been updated since the restart."""
+        state = self.coordinator.source_states.get(self._fuel_station_source)
+        if state is None:
+            return self.coordinator.first_refresh_done
+        return state.last_success is not None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the new state only if the station price has changed."""
+        if (
+            self._live
+            and self.coordinator.last_update_success
+            and not self.coordinator.station_changed(
+                self._fuel_station_source, self._fuel_station_id)
+            and (self._trend_due is None or time.monotonic() < self._trend_due)
+        ):
+            return
+        self._snapshot = None
+        start = time.perf_counter()
+        super()._handle_coordinator_update()
+        self.coordinator.metrics.add_render(time.perf_counter() - start)
+
+    @property
+    def _station_snapshot(self) -> StationSnapshot:
+        """Return the snapshot for the current refresh, building it if needed."""
+        if self._snapshot is None:
+            try:
+                station = self._fuel_station
+            except KeyError:
+                # Not updated since the restart yet.
+                self._live = False
+                self._snapshot = self._restored or StationSnapshot(
+                    native_value=None,
+                    fuels={},
+                    name=None,
+                    currency=None,
+                    icon=ICON_FUEL_STATION,
+                )
+                return self._snapshot
+            fuels = {
+                fuel.fuel_type: fuel.cost for fuel in station.available_fuels
+            }
+            if self.state_value == "name":
+                native_value = station.name
+            else:
+                native_value = fuels.get(self.state_value, station.name)
+            self._live = True
+            self._restored = None
+            self._snapshot = StationSnapshot(
+                native_value=native_value,
+                fuels=fuels,
+                name=station.name,
+                currency=station.currency.upper() if station.currency else None,
+                icon=(
+                    ICON_EV_CHARGER if station.brand == "Pod Point" else ICON_FUEL_STATION
+                ),
+            )
+        return self._snapshot
+
     @property
     def native_value(self) -> str:
         """Return the native value of the entity."""
-        if self.state_value == "name":
-            return self._fuel_station.name
-        return self._get_fuels.get(self.state_value, self._fuel_station.name)
+        return self._station_snapshot.native_value
 
     @property
     def _get_fuels(self) -> dict:
         """Return list of fuels."""
-        output = {}
-        for fuel in self._fuel_station.available_fuels:
-            output[fuel.fuel_type] = fuel.cost
-        return output
+        return self._station_snapshot.fuels
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
         """Return extra state attributes."""
+        snapshot = self._station_snapshot
+        if snapshot.attributes is None:
+            if not self._live:
+                snapshot.attributes = {"area": self.area}
+            elif self.attribute_profile == ATTRIBUTE_PROFILE_FULL:
+                snapshot.attributes = {
+                    **self._fuel_station.__dict__,
+                    **snapshot.fuels,
+                    **self._price_trend,
+                    "area": self.area
+                }
+            elif self.attribute_profile == ATTRIBUTE_PROFILE_PRICES:
+                snapshot.attributes = {
+                    **snapshot.fuels,
+                    **self._price_trend,
+                    "currency": self._fuel_station.currency,
+                    "area": self.area
+                }
+            else:
+                snapshot.attributes = {"area": self.area}
+            snapshot.attributes["stale"] = self.coordinator.source_stale(
+                self._fuel_station_source)
+        return snapshot.attributes
+
+    @property
+    def _price_trend(self) -> dict[str, Any]:
+        """Return the trend of the price shown as the state."""
+        history = self.coordinator.history
+        self._trend_due = None
+        if not history.enabled or self.state_value not in self._get_fuels:
+            return {}
+        stats = history.stats(
+            self._fuel_station_source, self._fuel_station_id, self.state_value)
+        if stats is None:
+            return {}
+        self._trend_due = time.monotonic() + PRICE_TREND_REFRESH.total_seconds()
         return {
-            **self._fuel_station.__dict__,
-            **self._get_fuels,
-            "area": self.area
+            "price_min": stats.minimum,
+            "price_max": stats.maximum,
+            "price_average": stats.average,
+            "price_change_24h": stats.change_24h,
+            "lowest_in_days": stats.lowest_in_days,
         }
 
     @property
     def icon(self) -> str:
         """Return entity icon."""
-        if self._fuel_station.brand == "Pod Point":
-            return "mdi:battery-charging"
-        return "mdi:gas-station"
+        return self._station_snapshot.icon
 
     @property
     def name(self) -> str:
         """Return the name of the entity."""
-        return self._fuel_station.name
+        return self._station_snapshot.name
 
     @property
     def native_unit_of_measurement(self) -> str:
         """Return unit of measurement."""
         if isinstance(self.native_value, str):
             return None
-        return self._fuel_station.currency.upper()
+        return self._station_snapshot.currency
 
     @property
     def state_class(self) -> str:
@@ -114,3 +541,156 @@ class FuelStationTracker(FuelStationEntity, SensorEntity):
         if isinstance(self.native_value, str):
             return None
         return SensorDeviceClass.MONETARY
+
+
+class CheapestStationSensor(CheapestStationEntity, SensorEntity):
+    """The station at a given price rank for a fuel type in an area."""
+
+    _last_station: dict | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the new state only if the station at this rank has changed."""
+        station = self._station
+        if self.coordinator.last_update_success and station == self._last_station:
+            return
+        self._last_station = station
+        start = time.perf_counter()
+        super()._handle_coordinator_update()
+        self.coordinator.metrics.add_render(time.perf_counter() - start)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the price of the station at this rank."""
+        station = self._station
+        if station is None:
+            return None
+        return station["cost"]
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return extra state attributes."""
+        station = self._station
+        return {
+            **({k: v for k, v in station.items() if k != "cost"} if station else {}),
+            "area": self.area[CONF_NAME],
+            "fuel_type": self.fuel_type,
+            "rank": self.rank,
+            "stale": station is not None and self.coordinator.source_stale(station["source"]),
+        }
+
+    @property
+    def icon(self) -> str:
+        """Return entity icon."""
+        return "mdi:gas-station"
+
+    @property
+    def name(self) -> str:
+        """Return the name of the entity."""
+        return f"{self.area[CONF_NAME]} cheapest {self.fuel_type} #{self.rank}"
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        """Return unit of measurement."""
+        station = self._station
+        if station is None or station["currency"] is None:
+            return None
+        return station["currency"].upper()
+
+    @property
+    def state_class(self) -> str:
+        """Return state type."""
+        return "total"
+
+    @property
+    def device_class(self) -> SensorDeviceClass | None:
+        """Return device class."""
+        return SensorDeviceClass.MONETARY
+
+
+@dataclass(frozen=True, kw_only=True)
+class MetricSensorEntityDescription(SensorEntityDescription):
+    """Describe a performance metric sensor."""
+
+    value_fn: Callable[[Metrics, str | None], float | int | None]
+
+
+SOURCE_METRICS = [
+    MetricSensorEntityDescription(
+        key="fetch_p95",
+        name="fetch time (p95)",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda metrics, src: metrics.source(src).fetch.as_dict()["p95_ms"],
+    ),
+    MetricSensorEntityDescription(
+        key="parse_p95",
+        name="parse time (p95)",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda metrics, src: metrics.source(src).parse.as_dict()["p95_ms"],
+    ),
+    MetricSensorEntityDescription(
+        key="response_bytes",
+        name="response size",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        value_fn=lambda metrics, src: metrics.source(src).last_response_bytes,
+    ),
+    MetricSensorEntityDescription(
+        key="stations",
+        name="stations",
+        value_fn=lambda metrics, src: metrics.source(src).stations,
+    ),
+]
+
+ENTRY_METRICS = [
+    MetricSensorEntityDescription(
+        key="entity_render",
+        name="Entity state write time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda metrics, _: metrics.render.as_dict()["last_ms"],
+    ),
+]
+
+SERVICE_METRICS = [
+    MetricSensorEntityDescription(
+        key=f"{service}_p95",
+        name=f"{service} latency (p95)",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda metrics, _, service=service: (
+            metrics.services[service].as_dict()["p95_ms"]
+            if service in metrics.services else None
+        ),
+    )
+    for service in (
+        "find_fuels",
+        "find_fuel_station",
+        "find_fuels_batch",
+        "find_fuels_along_route",
+        "get_price_history",
+    )
+]
+
+
+class MetricSensor(MetricEntity, SensorEntity):
+    """A performance metric of the integration or a data source."""
+
+    entity_description: MetricSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def name(self) -> str:
+        """Return the name of the entity."""
+        if self.source is None:
+            return f"Fuel Prices {self.entity_description.name}"
+        return f"{self.source} {self.entity_description.name}"
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the value of the metric."""
+        return self.entity_description.value_fn(self.coordinator.metrics, self.source)
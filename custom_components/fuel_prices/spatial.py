@@ -0,0 +1,524 @@
+"""Spatial index over the configured data source location caches.
+
+pyfuelprices and geopy are imported when first searched, as loading
+pyfuelprices loads every data source module.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pyfuelprices import FuelPrices
+    from pyfuelprices.fuel_locations import FuelLocation
+    from pyfuelprices.sources import Source
+
+_LOGGER = logging.getLogger(__name__)
+
+# Size of a grid cell in degrees, roughly 17 miles of latitude.
+CELL_SIZE = 0.25
+# Slightly below the real figure so bounding boxes never clip the radius.
+MILES_PER_DEGREE = 68.0
+# Mean length of a degree of latitude, for distances from a route.
+DEGREE_MILES = 69.09
+
+Cell = tuple[int, int]
+
+
+@dataclass
+class BatchQuery:
+    """A single lookup of a batch search."""
+
+    query_id: str
+    coordinates: tuple[float, float]
+    radius: float
+    fuel_types: list[str]
+    source_id: str = ""
+
+
+@dataclass
+class RouteSegment:
+    """A straight leg of a route and its bounding box padded by the corridor."""
+
+    start: tuple[float, float]
+    end: tuple[float, float]
+    # Miles per degree of longitude around the segment.
+    long_scale: float
+    box: tuple[float, float, float, float]
+    # Distance along the route to the start of the segment, in miles.
+    offset: float
+    length: float
+
+    def contains(self, lat: float, long: float) -> bool:
+        """Return if a point is inside the padded bounding box."""
+        return (self.box[0] <= lat <= self.box[2]
+                and self.box[1] <= long <= self.box[3])
+
+    def distance(self, lat: float, long: float) -> tuple[float, float]:
+        """Return the miles from a point to the segment and along the route to it."""
+        # Flat projection around the segment, accurate well past any corridor width.
+        x = (long - self.start[1]) * self.long_scale
+        y = (lat - self.start[0]) * DEGREE_MILES
+        dx = (self.end[1] - self.start[1]) * self.long_scale
+        dy = (self.end[0] - self.start[0]) * DEGREE_MILES
+        length_squared = dx * dx + dy * dy
+        t = 0.0
+        if length_squared > 0:
+            t = min(max((x * dx + y * dy) / length_squared, 0.0), 1.0)
+        return math.hypot(x - t * dx, y - t * dy), self.offset + t * self.length
+
+
+def decode_polyline(encoded: str, precision: int = 5) -> list[tuple[float, float]]:
+    """Decode an encoded polyline, as returned by most routing services."""
+    coordinates = []
+    factor = 10 ** precision
+    index = lat = long = 0
+    try:
+        while index < len(encoded):
+            deltas = []
+            for _ in range(2):
+                shift = result = 0
+                while True:
+                    byte = ord(encoded[index]) - 63
+                    index += 1
+                    result |= (byte & 0x1F) << shift
+                    shift += 5
+                    if byte < 0x20:
+                        break
+                deltas.append(~(result >> 1) if result & 1 else result >> 1)
+            lat += deltas[0]
+            long += deltas[1]
+            coordinates.append((lat / factor, long / factor))
+    except IndexError as err:
+        raise ValueError("Invalid encoded polyline.") from err
+    return coordinates
+
+
+def route_segments(route: list[tuple[float, float]], width: float) -> list[RouteSegment]:
+    """Split a route into segments padded by a corridor width in miles."""
+    if len(route) == 1:
+        route = [route[0], route[0]]
+    lat_pad = width / MILES_PER_DEGREE
+    segments = []
+    offset = 0.0
+    for start, end in zip(route, route[1:]):
+        long_scale = DEGREE_MILES * math.cos(math.radians((start[0] + end[0]) / 2))
+        # Pad longitude for the latitude furthest from the equator.
+        furthest = min(max(abs(start[0]), abs(end[0])) + lat_pad, 89.0)
+        long_pad = width / (MILES_PER_DEGREE * max(math.cos(math.radians(furthest)), 0.01))
+        length = math.hypot(
+            (end[1] - start[1]) * long_scale, (end[0] - start[0]) * DEGREE_MILES)
+        segments.append(RouteSegment(
+            start=start,
+            end=end,
+            long_scale=long_scale,
+            box=(
+                min(start[0], end[0]) - lat_pad,
+                min(start[1], end[1]) - long_pad,
+                max(start[0], end[0]) + lat_pad,
+                max(start[1], end[1]) + long_pad,
+            ),
+            offset=offset,
+            length=length,
+        ))
+        offset += length
+    return segments
+
+
+class StationIndex:
+    """Grid bucket index of every station known to the configured sources."""
+
+    def __init__(self, api: FuelPrices, cell_size: float = CELL_SIZE) -> None:
+        """Init the index."""
+        self.api = api
+        self._cell_size = cell_size
+        self._grids: dict[str, dict[Cell, list[FuelLocation]]] = {}
+        self._versions: dict[str, tuple] = {}
+
+    def _cell(self, lat: float, long: float) -> Cell:
+        """Return the grid cell for a coordinate."""
+        return (
+            math.floor(lat / self._cell_size),
+            math.floor(long / self._cell_size)
+        )
+
+    @staticmethod
+    def _version(source: Source) -> tuple:
+        """Return a cheap key that changes whenever a source cache is rebuilt."""
+        cache = source.location_cache or {}
+        return (id(cache), len(cache), source.next_update)
+
+    def _build_source(self, source: Source) -> dict[Cell, list[FuelLocation]]:
+        """Bucket every station of a single source."""
+        grid: dict[Cell, list[FuelLocation]] = {}
+        for site in (source.location_cache or {}).values():
+            if site.lat is None or site.long is None:
+                continue
+            grid.setdefault(self._cell(site.lat, site.long), []).append(site)
+        return grid
+
+    def refresh(self) -> None:
+        """Patch the index for any source whose location cache has changed."""
+        sources = self.api.configured_sources
+        for src_id in list(self._grids):
+            if src_id not in sources:
+                self._grids.pop(src_id)
+                self._versions.pop(src_id, None)
+        for src_id, source in sources.items():
+            version = self._version(source)
+            if self._versions.get(src_id) == version:
+                continue
+            self._grids[src_id] = self._build_source(source)
+            self._versions[src_id] = version
+            _LOGGER.debug("Rebuilt spatial index for %s with %s cells",
+                          src_id, len(self._grids[src_id]))
+
+    def _on_demand_sources(self, found: set[str], source_id: str = "") -> list[str]:
+        """Return the requested sources to search through the provider.
+
+        Sources with nothing cached, or that fetch stations on demand, are
+        searched when the index has none of their stations in range.
+        """
+        from pyfuelprices.sources import Source
+
+        sources = self.api.configured_sources
+        src_ids = [source_id] if source_id != "" else list(sources)
+        return [
+            src_id for src_id in src_ids
+            if src_id not in found and (
+                not sources[src_id].location_cache
+                or type(sources[src_id]).search_sites is not Source.search_sites
+            )
+        ]
+
+    async def _search_on_demand(
+        self, coordinates, radius: float, found: set[str], source_id: str = ""
+    ) -> list[dict]:
+        """Search the sources that populate their cache on demand.
+
+        Each source is searched on its own, which skips the reverse geocode
+        pyfuelprices does to pick the sources of a country.
+        """
+        locations = []
+        for src_id in self._on_demand_sources(found, source_id):
+            locations.extend(await self.api.find_fuel_locations_from_point(
+                coordinates, radius, src_id))
+        return locations
+
+    @staticmethod
+    def _deltas(coordinates, radius: float) -> tuple[float, float]:
+        """Return the half size in degrees of the bounding box of a radius."""
+        lat = coordinates[0]
+        lat_delta = radius / MILES_PER_DEGREE
+        long_delta = radius / (
+            MILES_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+        return lat_delta, long_delta
+
+    def _cells(
+        self, grid: dict[Cell, list[FuelLocation]], coordinates, radius: float
+    ) -> list[Cell]:
+        """Return the occupied cells of a grid covering a search radius."""
+        lat, long = coordinates
+        lat_delta, long_delta = self._deltas(coordinates, radius)
+        return self._box_cells(
+            grid, (lat - lat_delta, long - long_delta, lat + lat_delta, long + long_delta))
+
+    def _box_cells(
+        self, grid: dict[Cell, list[FuelLocation]], box: tuple[float, float, float, float]
+    ) -> list[Cell]:
+        """Return the occupied cells of a grid covering a bounding box."""
+        min_cell = self._cell(box[0], box[1])
+        max_cell = self._cell(box[2], box[3])
+        span = (max_cell[0] - min_cell[0] + 1) * (max_cell[1] - min_cell[1] + 1)
+        if span > len(grid):
+            # Very large box, cheaper to walk the occupied cells.
+            return [
+                (lat_cell, long_cell) for lat_cell, long_cell in grid
+                if min_cell[0] <= lat_cell <= max_cell[0]
+                and min_cell[1] <= long_cell <= max_cell[1]
+            ]
+        return [
+            (lat_cell, long_cell)
+            for lat_cell in range(min_cell[0], max_cell[0] + 1)
+            for long_cell in range(min_cell[1], max_cell[1] + 1)
+            if (lat_cell, long_cell) in grid
+        ]
+
+    def candidates(self, coordinates, radius: float, source_id: str = ""):
+        """Yield stations inside the bounding box of the search radius."""
+        lat, long = coordinates
+        lat_delta, long_delta = self._deltas(coordinates, radius)
+        if source_id != "":
+            grids = [self._grids.get(source_id, {})]
+        else:
+            grids = self._grids.values()
+        for grid in grids:
+            for cell in self._cells(grid, coordinates, radius):
+                for site in grid[cell]:
+                    if (abs(site.lat - lat) <= lat_delta and
+                            abs(site.long - long) <= long_delta):
+                        yield site
+
+    async def find_fuel_locations_from_point(
+        self, coordinates, radius: float, source_id: str = "", cached_only: bool = False
+    ) -> list[dict]:
+        """Retrieve all fuel locations within a radius (in miles) of a point.
+
+        With cached_only nothing is fetched, only the stations already in the
+        index are returned as they are.
+        """
+        from geopy import distance
+        from pyfuelprices.const import PROP_FUEL_LOCATION_DYNAMIC_BUILD
+
+        if source_id != "" and source_id not in self.api.configured_sources:
+            raise ValueError(f"Source {source_id} is not configured.")
+        self.refresh()
+        locations = []
+        # The sources with a station in range.
+        found: set[str] = set()
+        for src_id in [source_id] if source_id != "" else list(self._grids):
+            for site in self.candidates(coordinates, radius, src_id):
+                dist = distance.distance(coordinates, (site.lat, site.long)).miles
+                if dist >= radius:
+                    continue
+                if not cached_only and (site.props or {}).get(
+                        PROP_FUEL_LOCATION_DYNAMIC_BUILD, False):
+                    await site.dynamic_build_fuels()
+                locations.append({**site.__dict__, "distance": dist})
+                found.add(src_id)
+        if not cached_only:
+            # Some sources populate their cache on demand during a search.
+            locations.extend(
+                await self._search_on_demand(coordinates, radius, found, source_id))
+        return locations
+
+    @staticmethod
+    def _fuels_from_locations(locations: list[dict], fuel_type: str) -> list[dict]:
+        """Pick a single fuel type out of a list of locations, sorted by cost."""
+        fuels = []
+        for loc in locations:
+            cost = loc["available_fuels"].get(fuel_type, 0)
+            if cost > 0:
+                fuels.append({**loc, "cost": cost})
+        return sorted(fuels, key=lambda item: item["cost"])
+
+    async def find_fuel_from_point(
+        self, coordinates, radius: float, fuel_type: str, source_id: str = ""
+    ) -> list[dict]:
+        """Retrieve a single fuel type within a radius, sorted by cost."""
+        return self._fuels_from_locations(
+            await self.find_fuel_locations_from_point(coordinates, radius, source_id),
+            fuel_type
+        )
+
+    async def find_fuel_along_route(
+        self,
+        route: list[tuple[float, float]],
+        width: float,
+        fuel_type: str,
+        source_id: str = "",
+    ) -> list[dict]:
+        """Retrieve a fuel type within a corridor (in miles) of a route.
+
+        Results are sorted by cost, then by the detour to reach the station.
+        """
+        from pyfuelprices.const import PROP_FUEL_LOCATION_DYNAMIC_BUILD
+
+        if source_id != "" and source_id not in self.api.configured_sources:
+            raise ValueError(f"Source {source_id} is not configured.")
+        if len(route) == 0:
+            return []
+        self.refresh()
+        segments = route_segments(route, width)
+        route_box = (
+            min(segment.box[0] for segment in segments),
+            min(segment.box[1] for segment in segments),
+            max(segment.box[2] for segment in segments),
+            max(segment.box[3] for segment in segments),
+        )
+        if source_id != "":
+            grids = [self._grids.get(source_id, {})]
+        else:
+            grids = self._grids.values()
+        fuels = []
+        for grid in grids:
+            # Only the segments whose box reaches a cell are checked against
+            # the stations in it, so each station is visited once.
+            cells: dict[Cell, list[RouteSegment]] = {}
+            for segment in segments:
+                for cell in self._box_cells(grid, segment.box):
+                    cells.setdefault(cell, []).append(segment)
+            for cell, cell_segments in cells.items():
+                for site in grid[cell]:
+                    if not (route_box[0] <= site.lat <= route_box[2]
+                            and route_box[1] <= site.long <= route_box[3]):
+                        continue
+                    best = None
+                    for segment in cell_segments:
+                        if not segment.contains(site.lat, site.long):
+                            continue
+                        match = segment.distance(site.lat, site.long)
+                        if best is None or match[0] < best[0]:
+                            best = match
+                    if best is None or best[0] > width:
+                        continue
+                    if (site.props or {}).get(PROP_FUEL_LOCATION_DYNAMIC_BUILD, False):
+                        await site.dynamic_build_fuels()
+                    cost = next(
+                        (fuel.cost for fuel in site.available_fuels
+                         if fuel.fuel_type == fuel_type), 0
+                    )
+                    if not cost or cost <= 0:
+                        continue
+                    fuels.append({
+                        **site.__dict__,
+                        "cost": cost,
+                        "distance": best[0],
+                        # Out to the station and back onto the route.
+                        "detour": best[0] * 2,
+                        "route_distance": best[1],
+                    })
+        return sorted(fuels, key=lambda item: (item["cost"], item["detour"]))
+
+    def cheapest(
+        self, coordinates, radius: float, fuel_type: str, count: int, source_id: str = ""
+    ) -> list[dict]:
+        """Return the cheapest stations for a fuel type within a radius."""
+        from geopy import distance
+        from pyfuelprices.const import PROP_FUEL_LOCATION_SOURCE
+
+        if count <= 0:
+            return []
+        self.refresh()
+        # Bounded max heap of the best k, keyed on negated cost and distance,
+        # keeps this O(n log k) and skips the distance of pricier stations.
+        heap: list[tuple[float, float, int, FuelLocation]] = []
+        for i, site in enumerate(self.candidates(coordinates, radius, source_id)):
+            cost = next(
+                (fuel.cost for fuel in site.available_fuels
+                 if fuel.fuel_type == fuel_type), 0
+            )
+            if cost <= 0 or (len(heap) == count and -cost < heap[0][0]):
+                continue
+            dist = distance.distance(coordinates, (site.lat, site.long)).miles
+            if dist >= radius:
+                continue
+            item = (-cost, -dist, i, site)
+            if len(heap) < count:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+        ranked = sorted(
+            ((-cost, -dist, site) for cost, dist, _, site in heap),
+            key=lambda item: (item[0], item[1])
+        )
+        return [
+            {
+                "id": site.id,
+                "name": site.name,
+                "brand": site.brand,
+                "address": site.address,
+                "postal_code": site.postal_code,
+                "currency": site.currency,
+                "source": (site.props or {}).get(PROP_FUEL_LOCATION_SOURCE),
+                "cost": cost,
+                "distance": dist,
+            }
+            for cost, dist, site in ranked
+        ]
+
+    async def find_fuels_batch(
+        self, queries: list[BatchQuery]
+    ) -> dict[str, dict[str, list[dict]]]:
+        """Answer many fuel lookups with a single pass over the index."""
+        from geopy import distance
+        from pyfuelprices.const import PROP_FUEL_LOCATION_DYNAMIC_BUILD
+
+        for query in queries:
+            if query.source_id != "" and query.source_id not in self.api.configured_sources:
+                raise ValueError(f"Source {query.source_id} is not configured.")
+        self.refresh()
+        matches: list[list[dict]] = [[] for _ in queries]
+        found: list[set[str]] = [set() for _ in queries]
+        deltas = [self._deltas(q.coordinates, q.radius) for q in queries]
+        for src_id, grid in self._grids.items():
+            # Group the queries by cell so every station is visited once.
+            cells: dict[Cell, list[int]] = {}
+            for i, query in enumerate(queries):
+                if query.source_id not in ("", src_id):
+                    continue
+                for cell in self._cells(grid, query.coordinates, query.radius):
+                    cells.setdefault(cell, []).append(i)
+            for cell, cell_queries in cells.items():
+                for site in grid[cell]:
+                    data = None
+                    for i in cell_queries:
+                        query = queries[i]
+                        lat_delta, long_delta = deltas[i]
+                        if (abs(site.lat - query.coordinates[0]) > lat_delta or
+                                abs(site.long - query.coordinates[1]) > long_delta):
+                            continue
+                        dist = distance.distance(
+                            query.coordinates, (site.lat, site.long)).miles
+                        if dist >= query.radius:
+                            continue
+                        if data is None:
+                            if (site.props or {}).get(PROP_FUEL_LOCATION_DYNAMIC_BUILD, False):
+                                await site.dynamic_build_fuels()
+                            data = site.__dict__
+                        matches[i].append({**data, "distance": dist})
+                        found[i].add(src_id)
+        results = {}
+        for query, locations, query_found in zip(queries, matches, found):
+            # Some sources populate their cache on demand during a search.
+            locations.extend(await self._search_on_demand(
+                query.coordinates, query.radius, query_found, query.source_id))
+            results[query.query_id] = {
+                fuel_type: self._fuels_from_locations(locations, fuel_type)
+                for fuel_type in query.fuel_types
+            }
+        return results
+
+
+SORT_DISTANCE = "distance"
+SORT_PRICE = "price"
+SORT_UPDATED = "updated"
+SORT_KEYS = [SORT_DISTANCE, SORT_PRICE, SORT_UPDATED]
+
+
+def _price(item: dict) -> float:
+    """Return the price of a fuel, or the cheapest fuel of a station."""
+    if "cost" in item:
+        return item["cost"]
+    costs = [cost for cost in item["available_fuels"].values() if cost > 0]
+    return min(costs) if costs else math.inf
+
+
+def paginate(
+    items: list[dict],
+    sort_by: str | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+    fields: list[str] | None = None,
+) -> list[dict]:
+    """Return a sorted page of lookup results, optionally with only some fields."""
+    if sort_by is not None:
+        if sort_by == SORT_UPDATED:
+            key, reverse, top = (lambda item: item["last_updated"]), True, heapq.nlargest
+        elif sort_by == SORT_PRICE:
+            key, reverse, top = _price, False, heapq.nsmallest
+        else:
+            key, reverse, top = (lambda item: item["distance"]), False, heapq.nsmallest
+        if limit is not None and offset + limit < len(items):
+            # Only order the stations up to the end of the page.
+            items = top(offset + limit, items, key=key)
+        else:
+            items = sorted(items, key=key, reverse=reverse)
+    page = items[offset:] if limit is None else items[offset:offset + limit]
+    if fields:
+        return [{field: item[field] for field in fields if field in item} for item in page]
+    return page
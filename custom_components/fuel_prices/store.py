@@ -0,0 +1,125 @@
+"""Persistent snapshot of the data source location caches."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from pyfuelprices import FuelPrices
+    from pyfuelprices.fuel_locations import FuelLocation
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+
+def _pack_time(value: datetime | None) -> float | None:
+    """Convert a datetime into a timestamp."""
+    return value.timestamp() if value is not None else None
+
+
+def _unpack_time(value: float | None) -> datetime | None:
+    """Convert a timestamp back into a naive local datetime."""
+    return datetime.fromtimestamp(value) if value is not None else None
+
+
+def _pack_location(site: FuelLocation) -> list:
+    """Pack a fuel location into a compact list."""
+    # Private attributes are read directly as the public properties would
+    # mark the station as accessed and keep it out of cache cleanup.
+    return [
+        site._id,
+        site._name,
+        site._address,
+        site._postal_code,
+        site.lat,
+        site.long,
+        site._brand,
+        site._currency,
+        _pack_time(site.last_updated),
+        _pack_time(site.next_update),
+        site.props,
+        [[fuel.fuel_type, fuel.cost, fuel.props] for fuel in site.available_fuels],
+    ]
+
+
+def _unpack_location(data: list) -> FuelLocation:
+    """Rebuild a fuel location from its packed form."""
+    from pyfuelprices.fuel import Fuel
+    from pyfuelprices.fuel_locations import FuelLocation
+
+    (site_id, name, address, postal_code, lat, long, brand, currency,
+     last_updated, next_update, props, fuels) = data
+    return FuelLocation.create(
+        site_id=site_id,
+        name=name,
+        address=address,
+        lat=lat,
+        long=long,
+        brand=brand,
+        available_fuels=[Fuel(*fuel) for fuel in fuels],
+        last_updated=_unpack_time(last_updated) or datetime.now(),
+        next_update=_unpack_time(next_update),
+        postal_code=postal_code,
+        currency=currency,
+        props=props,
+    )
+
+
+class LocationCacheStore:
+    """Save and restore the last good location cache of every data source."""
+
+    def __init__(self, hass: HomeAssistant, api: FuelPrices, entry_id: str) -> None:
+        """Init the store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.locations"
+        )
+        self._api = api
+
+    async def async_restore(self, max_age: timedelta) -> bool:
+        """Load saved stations into empty source caches if fresh enough."""
+        data = await self._store.async_load()
+        if not data:
+            return False
+        age = dt_util.utcnow() - dt_util.utc_from_timestamp(data["saved_at"])
+        if age > max_age:
+            _LOGGER.debug("Ignoring saved stations as they are %s old", age)
+            return False
+        restored = 0
+        for src_id, locations in data.get("sources", {}).items():
+            source = self._api.configured_sources.get(src_id)
+            if source is None or len(source.location_cache or {}) > 0:
+                continue
+            if source.location_cache is None:
+                source.location_cache = {}
+            for packed in locations:
+                source.location_cache[packed[0]] = _unpack_location(packed)
+                restored += 1
+        _LOGGER.debug("Restored %s stations saved %s ago", restored, age)
+        return restored > 0
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Pack every cached station that can be rebuilt without the provider."""
+        from pyfuelprices.const import PROP_FUEL_LOCATION_DYNAMIC_BUILD
+
+        sources = {}
+        for src_id, source in self._api.configured_sources.items():
+            sources[src_id] = [
+                _pack_location(site)
+                for site in (source.location_cache or {}).values()
+                if not (site.props or {}).get(PROP_FUEL_LOCATION_DYNAMIC_BUILD, False)
+            ]
+        return {"saved_at": dt_util.utcnow().timestamp(), "sources": sources}
+
+    def async_schedule_save(self) -> None:
+        """Save the current location caches after a short delay."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
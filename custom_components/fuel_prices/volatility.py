@@ -0,0 +1,83 @@
+"""Learn when the prices of a data source change to adapt its poll interval."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+HOURS_PER_WEEK = 168
+# Weight given to a new observation of an hour of the week.
+SMOOTHING = 0.3
+# Observations needed for an hour of the week before it is trusted.
+MIN_SAMPLES = 2
+
+
+def _bucket(when: datetime) -> int:
+    """Return the local hour of the week of a time."""
+    local = dt_util.as_local(when)
+    return local.weekday() * 24 + local.hour
+
+
+class VolatilityTracker:
+    """Rate of price changes of a data source per hour of the week."""
+
+    def __init__(self, min_interval: timedelta, max_interval: timedelta) -> None:
+        """Init the tracker."""
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.rates: list[float] = [0.0] * HOURS_PER_WEEK
+        self.samples: list[int] = [0] * HOURS_PER_WEEK
+
+    def record(self, start: datetime, end: datetime, changed: int) -> None:
+        """Record the number of stations that changed price between two polls."""
+        hours = max((end - start).total_seconds() / 3600, 1 / 60)
+        rate = changed / hours
+        # Changes could have happened at any point since the last poll, so
+        # spread them over every hour of the week the window covers.
+        when = start.replace(minute=0, second=0, microsecond=0)
+        buckets = {_bucket(start)}
+        while when + timedelta(hours=1) < end and len(buckets) < HOURS_PER_WEEK:
+            when += timedelta(hours=1)
+            buckets.add(_bucket(when))
+        for bucket in buckets:
+            if self.samples[bucket] == 0:
+                self.rates[bucket] = rate
+            else:
+                self.rates[bucket] += SMOOTHING * (rate - self.rates[bucket])
+            self.samples[bucket] += 1
+
+    def _interval_for(self, bucket: int) -> timedelta:
+        """Scale the interval between the bounds by the volatility of an hour."""
+        peak = max(self.rates)
+        if peak <= 0:
+            return self.max_interval
+        volatility = self.rates[bucket] / peak
+        return self.max_interval - (self.max_interval - self.min_interval) * volatility
+
+    def interval(self, now: datetime, fallback: timedelta) -> timedelta:
+        """Return the time to wait before polling the data source again."""
+        bucket = _bucket(now)
+        if self.samples[bucket] < MIN_SAMPLES:
+            return min(max(fallback, self.min_interval), self.max_interval)
+        interval = self._interval_for(bucket)
+        # Wake up early if a more volatile hour starts before the next poll.
+        hour = dt_util.as_local(now).replace(minute=0, second=0, microsecond=0)
+        while (hour := hour + timedelta(hours=1)) < now + interval:
+            upcoming = _bucket(hour)
+            if self.samples[upcoming] >= MIN_SAMPLES:
+                interval = min(
+                    interval, hour - now + self._interval_for(upcoming))
+        return interval
+
+    def as_dict(self) -> dict:
+        """Return the learnt rates to be saved."""
+        return {"rates": self.rates, "samples": self.samples}
+
+    def load(self, data: dict) -> None:
+        """Restore previously saved rates."""
+        rates = data.get("rates", [])
+        samples = data.get("samples", [])
+        if len(rates) == HOURS_PER_WEEK and len(samples) == HOURS_PER_WEEK:
+            self.rates = [float(rate) for rate in rates]
+            self.samples = [int(sample) for sample in samples]
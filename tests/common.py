@@ -0,0 +1,86 @@
+"""Helpers shared by the tests."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from pyfuelprices.const import PROP_FUEL_LOCATION_SOURCE
+from pyfuelprices.fuel import Fuel
+from pyfuelprices.fuel_locations import FuelLocation
+from pyfuelprices.sources import Source
+
+from homeassistant import loader
+from homeassistant.config_entries import ConfigEntries, ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from custom_components.fuel_prices.const import DOMAIN, NAME
+
+
+def build_station(
+    station_id: str, lat: float, long: float, prices: dict[str, float], source: str = "fake"
+) -> FuelLocation:
+    """Build a station selling the given fuels."""
+    return FuelLocation.create(
+        site_id=station_id,
+        name=f"Station {station_id}",
+        address="1 High Street",
+        lat=lat,
+        long=long,
+        brand="Example",
+        available_fuels=[Fuel(fuel_type, cost) for fuel_type, cost in prices.items()],
+        currency="GBP",
+        props={PROP_FUEL_LOCATION_SOURCE: source},
+    )
+
+
+class FakeSource(Source):
+    """Data source serving a fixed set of stations, or failing on demand."""
+
+    provider_name = "fake"
+
+    def __init__(self, stations: dict[str, FuelLocation] | None = None) -> None:
+        """Init the source."""
+        # Never calls out, so no client session is needed.
+        super().__init__(client_session=MagicMock())
+        self.location_cache = dict(stations or {})
+        self.fail = False
+        self.updates = 0
+
+    async def update(self, areas=None, force=False) -> None:
+        """Count the update, raising when asked to fail."""
+        self.updates += 1
+        if self.fail:
+            raise ValueError("Update failed")
+
+
+async def setup_entry(hass: HomeAssistant, sources: dict[str, dict]) -> ConfigEntry:
+    """Set up an entry searching the given sources, without fetching from them."""
+    loader.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    entry = ConfigEntry(
+        domain=DOMAIN,
+        title=NAME,
+        data={
+            "sources": sources,
+            "areas": [{"name": "Home", "latitude": 52.0, "longitude": -1.0, "radius": 5.0}],
+            "timeout": 10,
+            "scan_interval": 1440,
+        },
+        options={},
+        source="user",
+        version=1,
+        minor_version=1,
+        unique_id=NAME,
+        discovery_keys={},
+        subentries_data=None,
+    )
+    with patch(
+        "custom_components.fuel_prices.FuelPricesCoordinator.async_refresh", AsyncMock()
+    ):
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+    return entry
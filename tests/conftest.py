@@ -0,0 +1,39 @@
+"""Fixtures for the Fuel Prices tests."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, Generator
+from unittest.mock import patch
+
+import pytest
+from aiohttp import ThreadedResolver
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import frame
+
+
+@pytest.fixture
+async def hass(tmp_path) -> AsyncGenerator[HomeAssistant]:
+    """Return a bare Home Assistant instance with its config in a temporary directory."""
+    hass = HomeAssistant(str(tmp_path))
+    frame.async_setup(hass)
+    yield hass
+    await hass.async_stop(force=True)
+
+
+class _Resolver(ThreadedResolver):
+    """Resolver closed like the one Home Assistant shares between sessions."""
+
+    async def real_close(self) -> None:
+        """Close the resolver."""
+        await self.close()
+
+
+@pytest.fixture
+def mock_resolver() -> Generator[None]:
+    """Resolve hosts without zeroconf, which needs the network integration."""
+    with patch(
+        "homeassistant.helpers.aiohttp_client._async_make_resolver",
+        side_effect=lambda hass: _Resolver(),
+    ):
+        yield
@@ -0,0 +1,71 @@
+"""Tests for the service response cache."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, patch
+
+from custom_components.fuel_prices.cache import ResponseCache, lookup_key, route_key
+
+
+def test_lookup_key_quantizes_coordinates() -> None:
+    """Test lookups a few metres apart share a key, while other lookups do not."""
+    key = lookup_key("fuels", (52.00012, -1.00034), 5.0, "E10")
+    assert lookup_key("fuels", (52.0001, -1.0002), 5.001, "E10") == key
+    assert lookup_key("fuels", ("52.00012", "-1.00034"), 5, "E10") == key
+    assert lookup_key("fuels", (52.002, -1.0003), 5.0, "E10") != key
+    assert lookup_key("fuels", (52.00012, -1.00034), 5.0, "B7") != key
+    assert lookup_key("fuels", (52.00012, -1.00034), 5.0, "E10", "fake") != key
+    assert lookup_key("locations", (52.00012, -1.00034), 5.0, "E10") != key
+
+
+def test_route_key() -> None:
+    """Test routes a few metres apart share a key and reversed routes do not."""
+    route = [(52.00012, -1.00034), (51.5, -0.1)]
+    key = route_key(route, 2.0, "E10")
+    assert route_key([(52.0001, -1.0003), (51.50004, -0.1)], 2, "E10") == key
+    assert route_key(route[::-1], 2.0, "E10") != key
+    assert route_key(route, 3.0, "E10") != key
+    assert route_key(route, 2.0, "E10", "fake") != key
+    hash(key)
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    """Test the cache keeps the most recently used responses."""
+    cache = ResponseCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats == {"size": 2, "hits": 3, "misses": 1}
+
+
+def test_cache_expires() -> None:
+    """Test responses are dropped once their time to live has passed."""
+    cache = ResponseCache(ttl=300)
+    with patch("custom_components.fuel_prices.cache.time.monotonic", return_value=1000):
+        cache.set("a", 1)
+    with patch("custom_components.fuel_prices.cache.time.monotonic", return_value=1299):
+        assert cache.get("a") == 1
+    with patch("custom_components.fuel_prices.cache.time.monotonic", return_value=1301):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+    cache.set("b", 2)
+    cache.clear()
+    assert cache.get("b") is None
+
+
+async def test_get_or_compute() -> None:
+    """Test a response is computed once and then served from the cache."""
+    cache = ResponseCache()
+    compute = AsyncMock(return_value=[{"id": "1"}])
+
+    assert await cache.async_get_or_compute("a", compute) == [{"id": "1"}]
+    assert await cache.async_get_or_compute("a", compute) == [{"id": "1"}]
+
+    compute.assert_awaited_once()
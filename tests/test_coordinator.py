@@ -0,0 +1,47 @@
+"""Tests for the data coordinator."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from pyfuelprices import FuelPrices
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.fuel_prices.coordinator import FuelPricesCoordinator
+from custom_components.fuel_prices.volatility import VolatilityTracker
+
+from .common import FakeSource, build_station
+
+
+def build_coordinator(hass: HomeAssistant, source: FakeSource) -> FuelPricesCoordinator:
+    """Build a coordinator over a single fake source."""
+    api = FuelPrices()
+    api.configured_sources = {"fake": source}
+    api.configured_areas = []
+    return FuelPricesCoordinator(hass, api, "test")
+
+
+async def test_stale_recovery_is_not_recorded_as_price_changes(hass: HomeAssistant) -> None:
+    """Test stations redrawn for their stale flag are not counted as price changes."""
+    source = FakeSource({
+        str(i): build_station(str(i), 52.0, -1.0 + i / 100, {"E10": 1.5})
+        for i in range(5)
+    })
+    coordinator = build_coordinator(hass, source)
+    assert await coordinator._async_update_source("fake")
+
+    source.fail = True
+    assert not await coordinator._async_update_source("fake")
+    assert coordinator.source_stale("fake")
+
+    source.fail = False
+    source.location_cache["0"].get_fuel("E10").update("E10", 1.4, None)
+    with patch.object(VolatilityTracker, "record") as record:
+        assert await coordinator._async_update_source("fake")
+
+    assert not coordinator.source_stale("fake")
+    # Every station shows its new stale flag, but only one changed price.
+    assert coordinator.changed_stations == {("fake", str(i)) for i in range(5)}
+    record.assert_called_once()
+    assert record.call_args.args[2] == 1
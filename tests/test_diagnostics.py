@@ -0,0 +1,23 @@
+"""Tests for the diagnostics."""
+
+from __future__ import annotations
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.fuel_prices.diagnostics import async_get_config_entry_diagnostics
+
+from .common import setup_entry
+
+
+@pytest.mark.usefixtures("mock_resolver")
+async def test_provider_config_is_redacted(hass: HomeAssistant) -> None:
+    """Test the data source settings, which can hold credentials, are redacted."""
+    entry = await setup_entry(hass, {"finelly": {"USER_ID": "secret"}})
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert "secret" not in str(diagnostics)
+    assert diagnostics["entry"]["data"]["sources"] == "**REDACTED**"
+    assert diagnostics["entry"]["data"]["areas"][0]["latitude"] == "**REDACTED**"
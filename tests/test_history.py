@@ -0,0 +1,159 @@
+"""Tests for the price history."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.fuel_prices.history import (
+    CAPACITY,
+    DAY,
+    PriceHistory,
+    PriceSeries,
+)
+
+from .common import build_station
+
+NOW = 1_700_000_000
+
+
+def test_series_skips_unchanged_prices() -> None:
+    """Test only price changes are kept."""
+    series = PriceSeries()
+    assert series.append(NOW, 1.5)
+    assert not series.append(NOW + 60, 1.5)
+    assert series.append(NOW + 120, 1.4)
+    assert list(series.samples()) == [(NOW, 1.5), (NOW + 120, 1.4)]
+    assert list(series.samples(reverse=True)) == [(NOW + 120, 1.4), (NOW, 1.5)]
+
+
+def test_series_wraps_around() -> None:
+    """Test the oldest changes are overwritten once the buffer is full."""
+    series = PriceSeries()
+    for i in range(CAPACITY + 10):
+        series.append(NOW + i, 1.0 + i / 1000)
+
+    assert len(series) == CAPACITY
+    assert series.start == 10
+    assert list(series.samples()) == [
+        (NOW + i, 1.0 + i / 1000) for i in range(10, CAPACITY + 10)
+    ]
+    assert series.price_at(NOW + 20) == pytest.approx(1.02)
+    assert series.price_at(NOW) is None
+
+
+def test_series_since_after_wrapping() -> None:
+    """Test the changes since a time start with the price in effect then."""
+    series = PriceSeries()
+    for i in range(CAPACITY + 10):
+        series.append(NOW + i * 10, 1.0 + i / 1000)
+
+    times, prices = series.since(NOW + 1005)
+
+    assert times[0] == NOW + 1000
+    assert prices[0] == pytest.approx(1.1)
+    assert times[-1] == NOW + (CAPACITY + 9) * 10
+    assert list(times) == sorted(times)
+
+
+def test_series_stats() -> None:
+    """Test the trend over the window weighs each price by how long it lasted."""
+    series = PriceSeries()
+    series.append(NOW - 3 * DAY, 1.6)
+    series.append(NOW - 2 * DAY, 1.4)
+    series.append(NOW - DAY // 2, 1.5)
+
+    stats = series.stats(NOW, 2 * DAY)
+
+    assert stats.minimum == 1.4
+    assert stats.maximum == 1.5
+    assert stats.average == pytest.approx((1.4 * 1.5 + 1.5 * 0.5) / 2)
+    assert stats.change_24h == pytest.approx(0.1)
+    # The price was lower until half a day ago.
+    assert stats.lowest_in_days == 0
+
+
+def test_series_stats_lowest_in_days() -> None:
+    """Test the days since the price was last lower than the current one."""
+    series = PriceSeries()
+    series.append(NOW - 10 * DAY, 1.6)
+    series.append(NOW - 3 * DAY, 1.3)
+
+    stats = series.stats(NOW, 14 * DAY)
+
+    # Never lower, so the lowest of the whole history kept.
+    assert stats.lowest_in_days == 10
+    assert stats.change_24h == 0
+
+    series.append(NOW - 2 * DAY, 1.2)
+    series.append(NOW - DAY // 2, 1.25)
+    assert series.stats(NOW, 14 * DAY).lowest_in_days == 0
+    assert series.stats(NOW + 3 * DAY, 14 * DAY).lowest_in_days == 3
+    assert PriceSeries().stats(NOW, DAY) is None
+
+
+def test_history_round_trip() -> None:
+    """Test saved price changes are restored as they were."""
+    history = PriceHistory(days=7)
+    now = dt_util.utcnow()
+    for minutes in range(CAPACITY + 5, 0, -1):
+        station = build_station("1", 52.0, -1.0, {"E10": 1.5 + minutes / 1000, "B7": 1.6})
+        history.record("fake", "1", station, now - timedelta(minutes=minutes))
+    history.record("other", "2", build_station("2", 52.0, -1.0, {"E10": 1.4}), now)
+
+    restored = PriceHistory(days=7)
+    restored.load(history.as_dict())
+
+    for src_id, station_id in (("fake", "1"), ("other", "2")):
+        assert restored.station_history(station_id, src_id) == history.station_history(
+            station_id, src_id)
+    assert len(restored.station_history("1")["fuels"]["E10"]["prices"]) == CAPACITY
+
+
+def test_history_drops_changes_outside_the_window() -> None:
+    """Test only the price in effect at the start of the window is saved."""
+    history = PriceHistory(days=1)
+    now = dt_util.utcnow()
+    for days, price in ((5, 1.6), (3, 1.5), (0, 1.4)):
+        history.record(
+            "fake", "1", build_station("1", 52.0, -1.0, {"E10": price}), now - timedelta(days=days))
+
+    restored = PriceHistory(days=1)
+    restored.load(history.as_dict())
+
+    prices = restored.station_history("1")["fuels"]["E10"]["prices"]
+    assert [item["price"] for item in prices] == [1.5, 1.4]
+
+
+def test_history_ignores_mismatched_data() -> None:
+    """Test a saved source whose arrays do not line up is skipped."""
+    history = PriceHistory(days=7)
+    history.record("fake", "1", build_station("1", 52.0, -1.0, {"E10": 1.5}), dt_util.utcnow())
+    data = history.as_dict()
+    data["sources"]["fake"]["stations"].append("2")
+
+    restored = PriceHistory(days=7)
+    restored.load(data)
+
+    assert restored.station_history("1")["fuels"] == {}
+
+
+def test_history_prune_and_stats() -> None:
+    """Test the stats of a station and forgetting the stations that left."""
+    history = PriceHistory(days=7)
+    now = dt_util.utcnow()
+    history.record("fake", "1", build_station("1", 52.0, -1.0, {"E10": 1.5}), now)
+    history.record("fake", "2", build_station("2", 52.0, -1.0, {"E10": 1.4}), now)
+
+    with patch.object(dt_util, "utcnow", return_value=now + timedelta(hours=1)):
+        assert history.stats("fake", "1", "E10").minimum == 1.5
+        assert history.stats(None, "2", "E10").minimum == 1.4
+    assert history.stats("fake", "1", "B7") is None
+
+    history.prune("fake", {"2"})
+    assert history.stats("fake", "1", "E10") is None
+    assert history.stats("fake", "2", "E10") is not None
@@ -0,0 +1,95 @@
+"""Tests for the conditional request cache."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import AsyncGenerator
+from unittest.mock import patch
+
+import pytest
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from custom_components.fuel_prices import http_cache
+from custom_components.fuel_prices.http_cache import ConditionalRequestCache
+
+
+async def _feed(request: web.Request) -> web.Response:
+    """Serve a body per path and Authorization header, revalidated by its ETag."""
+    etag = f'"{request.path}-{request.headers.get("Authorization", "")}"'
+    if request.headers.get("If-None-Match") == etag:
+        return web.Response(status=304, headers={"ETag": etag})
+    return web.json_response(
+        {"path": request.path, "auth": request.headers.get("Authorization")},
+        headers={"ETag": etag},
+    )
+
+
+@pytest.fixture
+async def server() -> AsyncGenerator[TestServer]:
+    """Return a server of cacheable responses."""
+    app = web.Application()
+    app.router.add_get("/{name}", _feed)
+    async with TestServer(app) as server:
+        yield server
+
+
+async def test_replays_not_modified(hass: HomeAssistant, server: TestServer) -> None:
+    """Test a 304 is served as the cached 200 response."""
+    cache = ConditionalRequestCache(hass, "test")
+    async with ClientSession(middlewares=(cache,)) as session:
+        for _ in range(2):
+            async with session.get(server.make_url("/feed")) as response:
+                assert response.status == 200
+                assert response.content_type == "application/json"
+                assert await response.json() == {"path": "/feed", "auth": None}
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+
+
+async def test_key_includes_authorization(hass: HomeAssistant, server: TestServer) -> None:
+    """Test requests with different credentials do not share a cached body."""
+    cache = ConditionalRequestCache(hass, "test")
+    async with ClientSession(middlewares=(cache,)) as session:
+        for auth in ("a", "b"):
+            async with session.get(
+                server.make_url("/feed"), headers={"Authorization": auth}
+            ) as response:
+                assert (await response.json())["auth"] == auth
+    assert cache.stats["entries"] == 2
+    assert cache.stats["hits"] == 0
+
+
+async def test_evicts_least_recently_used(hass: HomeAssistant, server: TestServer) -> None:
+    """Test the oldest bodies are removed past the size of the cache."""
+    cache = ConditionalRequestCache(hass, "test")
+    body_dir = hass.config.path(".storage", "fuel_prices.test.http_bodies")
+    async with ClientSession(middlewares=(cache,)) as session:
+        with patch.object(http_cache, "MAX_CACHE_SIZE", 80):
+            for name in ("one", "two", "one", "three"):
+                async with session.get(server.make_url(f"/{name}")) as response:
+                    await response.read()
+    # Each body is about 30 bytes, so only the two most recently used fit.
+    assert cache.stats["entries"] == 2
+    assert len(os.listdir(body_dir)) == 2
+    await cache.async_remove()
+    assert not os.path.exists(body_dir)
+
+
+@pytest.mark.usefixtures("mock_resolver")
+async def test_replays_through_home_assistant_session(
+    hass: HomeAssistant, server: TestServer
+) -> None:
+    """Test a session from the Home Assistant helper serves the cached body."""
+    cache = ConditionalRequestCache(hass, "test")
+    # Closed with Home Assistant.
+    session = async_create_clientsession(hass, middlewares=(cache,))
+    for _ in range(2):
+        async with session.get(server.make_url("/feed")) as response:
+            assert response.status == 200
+            assert await response.text() == '{"path": "/feed", "auth": null}'
+            assert await response.json() == {"path": "/feed", "auth": None}
+    assert cache.stats["hits"] == 1
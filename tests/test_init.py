@@ -0,0 +1,37 @@
+"""Tests for setting up the integration."""
+
+from __future__ import annotations
+
+import pytest
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+from custom_components.fuel_prices import FIND_FUELS_BATCH_SCHEMA
+
+from .common import setup_entry
+
+
+@pytest.mark.usefixtures("mock_resolver")
+async def test_setup_and_unload_entry(hass: HomeAssistant) -> None:
+    """Test an entry loads with its data source session and unloads again."""
+    entry = await setup_entry(hass, {"asda": {}})
+
+    assert entry.state is ConfigEntryState.LOADED
+    session = entry.runtime_data.coordinator.api.client_session
+    assert entry.runtime_data.http_cache in session._middlewares
+    assert session.timeout.total == 10
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert entry.state is ConfigEntryState.NOT_LOADED
+
+
+def test_batch_query_ids_must_be_unique() -> None:
+    """Test batch queries sharing an id are rejected, including position ids."""
+    queries = [{"id": "home", "types": "E10"}, {"types": "B7"}]
+    assert FIND_FUELS_BATCH_SCHEMA({"queries": queries})
+
+    with pytest.raises(vol.Invalid, match="Duplicate query id: home"):
+        FIND_FUELS_BATCH_SCHEMA({"queries": [*queries, {"id": "home"}]})
+    with pytest.raises(vol.Invalid, match="Duplicate query id: 1"):
+        FIND_FUELS_BATCH_SCHEMA({"queries": [*queries, {"id": "1"}]})
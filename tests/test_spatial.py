@@ -0,0 +1,350 @@
+"""Tests for the spatial index."""
+
+from __future__ import annotations
+
+import math
+import random
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from geopy import distance
+from pyfuelprices import FuelPrices
+from pyfuelprices.fuel_locations import FuelLocation
+
+from custom_components.fuel_prices.spatial import (
+    BatchQuery,
+    StationIndex,
+    decode_polyline,
+    paginate,
+)
+
+from .common import FakeSource, build_station
+
+CENTER = (52.0, -1.0)
+
+
+def build_stations(count: int, seed: int = 1) -> dict[str, FuelLocation]:
+    """Scatter stations with random prices up to two degrees around the center."""
+    rng = random.Random(seed)
+    stations = {}
+    for i in range(count):
+        prices = {"E10": round(rng.uniform(1.3, 1.6), 3)}
+        if i % 3:
+            prices["B7"] = round(rng.uniform(1.4, 1.7), 3)
+        stations[str(i)] = build_station(
+            str(i),
+            CENTER[0] + rng.uniform(-2, 2),
+            CENTER[1] + rng.uniform(-2, 2),
+            prices,
+        )
+    return stations
+
+
+def build_index(stations: dict[str, FuelLocation], cell_size: float = 0.25) -> StationIndex:
+    """Build an index over a single fake source."""
+    api = FuelPrices()
+    api.configured_sources = {"fake": FakeSource(stations)}
+    api.configured_areas = []
+    return StationIndex(api, cell_size)
+
+
+def brute_force(
+    stations: dict[str, FuelLocation], coordinates, radius: float
+) -> dict[str, float]:
+    """Return the distance of every station within a radius by scanning them all."""
+    found = {}
+    for station_id, site in stations.items():
+        dist = distance.distance(coordinates, (site.lat, site.long)).miles
+        if dist < radius:
+            found[station_id] = dist
+    return found
+
+
+def route_distance(site: FuelLocation, route: list[tuple[float, float]]) -> float:
+    """Return the geodesic miles from a station to the closest point of a route."""
+    best = math.inf
+    for start, end in zip(route, route[1:]):
+
+        def point(t: float, start=start, end=end) -> tuple[float, float]:
+            return (start[0] + (end[0] - start[0]) * t, start[1] + (end[1] - start[1]) * t)
+
+        # The distance to a point moving along a single leg has one minimum.
+        low, high = 0.0, 1.0
+        for _ in range(40):
+            third = (high - low) / 3
+            if (distance.distance(point(low + third), (site.lat, site.long))
+                    < distance.distance(point(high - third), (site.lat, site.long))):
+                high -= third
+            else:
+                low += third
+        best = min(best, distance.distance(point(low), (site.lat, site.long)).miles)
+    return best
+
+
+def rough_route_distance(site: FuelLocation, route: list[tuple[float, float]]) -> float:
+    """Return the flat miles from a station to the nearest sampled point of a route."""
+    return min(
+        math.hypot(
+            (lat - site.lat) * 69,
+            (long - site.long) * 69 * math.cos(math.radians(lat)),
+        )
+        for start, end in zip(route, route[1:])
+        for lat, long in (
+            (start[0] + (end[0] - start[0]) * i / 100, start[1] + (end[1] - start[1]) * i / 100)
+            for i in range(101)
+        )
+    )
+
+
+@pytest.mark.parametrize("cell_size", [0.05, 0.25, 1.0])
+@pytest.mark.parametrize(
+    ("coordinates", "radius"),
+    [(CENTER, 5), (CENTER, 25), ((52.7, -0.2), 12), ((51.0, -2.9), 40), (CENTER, 500)],
+)
+async def test_radius_search_matches_brute_force(
+    cell_size: float, coordinates: tuple[float, float], radius: float
+) -> None:
+    """Test a radius search finds the same stations and distances as a full scan."""
+    stations = build_stations(2000)
+    index = build_index(stations, cell_size)
+
+    found = await index.find_fuel_locations_from_point(coordinates, radius)
+
+    expected = brute_force(stations, coordinates, radius)
+    assert {item["id"]: item["distance"] for item in found} == pytest.approx(expected)
+
+
+async def test_radius_search_by_source() -> None:
+    """Test a search limited to a source ignores the others."""
+    stations = build_stations(200)
+    index = build_index(stations)
+    index.api.configured_sources["other"] = FakeSource({
+        "other": build_station("other", *CENTER, {"E10": 1.2}, source="other")
+    })
+
+    found = await index.find_fuel_locations_from_point(CENTER, 10, "other")
+    assert [item["id"] for item in found] == ["other"]
+
+    with pytest.raises(ValueError):
+        await index.find_fuel_locations_from_point(CENTER, 10, "missing")
+
+
+async def test_index_follows_source_cache() -> None:
+    """Test the index picks up stations added to a source cache."""
+    index = build_index({})
+    assert await index.find_fuel_locations_from_point(CENTER, 5, cached_only=True) == []
+
+    index.api.configured_sources["fake"].location_cache = {
+        "1": build_station("1", *CENTER, {"E10": 1.5})
+    }
+    found = await index.find_fuel_locations_from_point(CENTER, 5, cached_only=True)
+    assert [item["id"] for item in found] == ["1"]
+
+
+class OnDemandSource(FakeSource):
+    """Data source fetching the stations of a search that are not cached yet."""
+
+    def __init__(self, stations: dict[str, FuelLocation], remote: dict[str, FuelLocation]) -> None:
+        """Init the source."""
+        super().__init__(stations)
+        self.remote = remote
+        self.searches = 0
+
+    async def search_sites(self, coordinates, radius: float) -> list[dict]:
+        """Fetch the remote stations in range into the cache."""
+        self.searches += 1
+        found = brute_force(self.remote, coordinates, radius)
+        for station_id in found:
+            self.location_cache[station_id] = self.remote[station_id]
+        return [
+            {**self.remote[station_id].__dict__, "distance": dist}
+            for station_id, dist in found.items()
+        ]
+
+
+async def test_on_demand_search_outside_the_cache() -> None:
+    """Test sources that fetch on demand are searched when nothing cached is in range."""
+    cached = {"1": build_station("1", *CENTER, {"E10": 1.5}, source="remote")}
+    remote = {"2": build_station("2", 48.1, 11.6, {"E10": 1.7}, source="remote")}
+    index = build_index(build_stations(200))
+    source = OnDemandSource(cached, remote)
+    index.api.configured_sources["remote"] = source
+
+    found = await index.find_fuel_locations_from_point((48.1, 11.6), 5)
+    assert [item["id"] for item in found] == ["2"]
+    fuels = await index.find_fuels_batch([BatchQuery("away", (48.1, 11.6), 5, ["E10"])])
+    assert [item["id"] for item in fuels["away"]["E10"]] == ["2"]
+    assert await index.find_fuel_locations_from_point(
+        (48.1, 11.6), 5, cached_only=True) != []
+
+    # Stations of the source in range are served from the index.
+    searches = source.searches
+    found = await index.find_fuel_locations_from_point(CENTER, 1, "remote")
+    assert [item["id"] for item in found] == ["1"]
+    assert source.searches == searches
+
+
+async def test_cached_sources_are_not_searched_again() -> None:
+    """Test a source searching its own cache is not searched when nothing is in range."""
+    index = build_index(build_stations(200))
+    with patch.object(
+        index.api, "find_fuel_locations_from_point", AsyncMock(return_value=[])
+    ) as search:
+        assert await index.find_fuel_locations_from_point((48.1, 11.6), 5) == []
+    search.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("coordinates", "radius", "count"),
+    [(CENTER, 30, 5), (CENTER, 10, 1), ((52.5, -1.5), 60, 10), (CENTER, 500, 3)],
+)
+def test_cheapest_matches_brute_force(
+    coordinates: tuple[float, float], radius: float, count: int
+) -> None:
+    """Test the bounded heap returns the same top stations as a full sort."""
+    stations = build_stations(2000)
+    index = build_index(stations, 0.1)
+
+    cheapest = index.cheapest(coordinates, radius, "B7", count)
+
+    ranked = sorted(
+        (stations[station_id].get_fuel("B7").cost, dist, station_id)
+        for station_id, dist in brute_force(stations, coordinates, radius).items()
+        if any(fuel.fuel_type == "B7" for fuel in stations[station_id].available_fuels)
+    )[:count]
+    assert [item["id"] for item in cheapest] == [station_id for _, _, station_id in ranked]
+    assert [item["cost"] for item in cheapest] == [cost for cost, _, _ in ranked]
+    assert [item["distance"] for item in cheapest] == pytest.approx(
+        [dist for _, dist, _ in ranked])
+
+
+def test_cheapest_without_stations() -> None:
+    """Test no stations are ranked for an unknown fuel or a zero count."""
+    index = build_index(build_stations(100))
+    assert index.cheapest(CENTER, 50, "LPG", 5) == []
+    assert index.cheapest(CENTER, 50, "E10", 0) == []
+
+
+@pytest.mark.parametrize(
+    ("route", "width"),
+    [
+        ([(51.2, -2.5), (52.8, 0.5)], 2),
+        ([(51.2, -2.5), (52.0, -1.0), (51.5, 0.8)], 5),
+        ([(52.0, -1.0)], 10),
+    ],
+)
+async def test_route_corridor_matches_brute_force(
+    route: list[tuple[float, float]], width: float
+) -> None:
+    """Test the corridor holds the stations near the route and nothing far from it."""
+    stations = build_stations(2000)
+    index = build_index(stations)
+
+    found = {
+        item["id"]: item
+        for item in await index.find_fuel_along_route(route, width, "E10")
+    }
+    assert found
+
+    route = route if len(route) > 1 else route * 2
+    for station_id, site in stations.items():
+        if rough_route_distance(site, route) > width + 5:
+            # Far away, whatever the projection.
+            assert station_id not in found
+            continue
+        dist = route_distance(site, route)
+        # The corridor uses a flat projection, allow for it at the edge.
+        if dist < width * 0.99:
+            assert station_id in found
+            assert found[station_id]["distance"] == pytest.approx(dist, rel=0.02, abs=0.01)
+        elif dist > width * 1.01:
+            assert station_id not in found
+    costs = [(item["cost"], item["detour"]) for item in found.values()]
+    assert costs == sorted(costs)
+
+
+async def test_route_offset_along_the_route() -> None:
+    """Test the distance along the route grows towards its end."""
+    stations = {
+        str(i): build_station(str(i), 52.0, -2.0 + i / 10, {"E10": 1.5})
+        for i in range(21)
+    }
+    index = build_index(stations)
+
+    found = await index.find_fuel_along_route([(52.0, -2.0), (52.0, 0.0)], 1, "E10")
+
+    by_offset = sorted(found, key=lambda item: item["route_distance"])
+    assert [item["id"] for item in by_offset] == [str(i) for i in range(21)]
+    assert by_offset[-1]["route_distance"] == pytest.approx(
+        distance.distance((52.0, -2.0), (52.0, 0.0)).miles, rel=0.01)
+
+
+async def test_batch_matches_single_searches() -> None:
+    """Test a batch answers every query like a search of its own."""
+    stations = build_stations(2000)
+    index = build_index(stations)
+    queries = [
+        BatchQuery("home", CENTER, 10, ["E10", "B7"]),
+        BatchQuery("work", (52.4, -0.6), 20, ["B7"]),
+        BatchQuery("empty", (60.0, 10.0), 5, ["E10"]),
+    ]
+
+    results = await index.find_fuels_batch(queries)
+
+    for query in queries:
+        for fuel_type in query.fuel_types:
+            expected = await index.find_fuel_from_point(
+                query.coordinates, query.radius, fuel_type)
+            assert results[query.query_id][fuel_type] == expected
+    assert results["empty"] == {"E10": []}
+
+
+def test_decode_polyline() -> None:
+    """Test decoding the reference polyline of the encoding."""
+    assert decode_polyline("_p~iF~ps|U_ulLnnqC_mqNvxq`@") == [
+        (38.5, -120.2),
+        (40.7, -120.95),
+        (43.252, -126.453),
+    ]
+    assert decode_polyline("") == []
+    assert decode_polyline("_izlhA~rlgdF", precision=6) == [(38.5, -120.2)]
+
+
+def test_decode_invalid_polyline() -> None:
+    """Test a truncated polyline is rejected."""
+    with pytest.raises(ValueError):
+        decode_polyline("_p~iF~ps|U_")
+
+
+@pytest.mark.parametrize("sort_by", ["distance", "price", "updated"])
+@pytest.mark.parametrize(("limit", "offset"), [(None, 0), (5, 0), (5, 10), (50, 90), (10, 200)])
+def test_paginate_matches_full_sort(sort_by: str, limit: int | None, offset: int) -> None:
+    """Test a partially sorted page matches the page of a full sort."""
+    rng = random.Random(2)
+    items = [
+        {
+            "id": str(i),
+            "distance": rng.uniform(0, 10),
+            "cost": round(rng.uniform(1.3, 1.6), 3),
+            "last_updated": rng.randrange(1_000_000),
+        }
+        for i in range(100)
+    ]
+    key = {
+        "distance": lambda item: item["distance"],
+        "price": lambda item: item["cost"],
+        "updated": lambda item: -item["last_updated"],
+    }[sort_by]
+    expected = sorted(items, key=key)
+    expected = expected[offset:] if limit is None else expected[offset:offset + limit]
+
+    page = paginate(items, sort_by=sort_by, limit=limit, offset=offset)
+
+    assert [key(item) for item in page] == [key(item) for item in expected]
+
+
+def test_paginate_fields() -> None:
+    """Test only the requested fields are returned."""
+    items = [{"id": "1", "name": "One", "distance": 1.0}]
+    assert paginate(items, fields=["name", "brand"]) == [{"name": "One"}]
+    assert paginate(items) == items
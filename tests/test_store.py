@@ -0,0 +1,81 @@
+"""Tests for the saved location caches."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from pyfuelprices import FuelPrices
+from pyfuelprices.const import PROP_FUEL_LOCATION_DYNAMIC_BUILD
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.fuel_prices.store import LocationCacheStore
+
+from .common import FakeSource, build_station
+
+
+def build_store(hass: HomeAssistant, sources: dict[str, FakeSource]) -> LocationCacheStore:
+    """Build a store over the given sources."""
+    api = FuelPrices()
+    api.configured_sources = sources
+    api.configured_areas = []
+    return LocationCacheStore(hass, api, "test")
+
+
+async def save(store: LocationCacheStore) -> None:
+    """Save the location caches straight away."""
+    await store._store.async_save(store._data_to_save())
+
+
+async def test_round_trip(hass: HomeAssistant) -> None:
+    """Test saved stations are restored with their prices and details."""
+    station = build_station("1", 52.1, -1.2, {"E10": 1.459, "B7": 1.529})
+    station.postal_code = "AB1 2CD"
+    station.last_updated = datetime(2024, 1, 1, 12, 30)
+    dynamic = build_station("2", 52.2, -1.3, {"E10": 1.5})
+    dynamic.props[PROP_FUEL_LOCATION_DYNAMIC_BUILD] = True
+    await save(build_store(hass, {"fake": FakeSource({"1": station, "2": dynamic})}))
+
+    source = FakeSource()
+    assert await build_store(hass, {"fake": source}).async_restore(timedelta(hours=1))
+
+    # Stations built on demand cannot be rebuilt without the provider.
+    assert list(source.location_cache) == ["1"]
+    restored = source.location_cache["1"]
+    assert restored.__dict__ == station.__dict__
+    assert restored.last_updated == station.last_updated
+    assert restored.props == station.props
+
+
+async def test_restore_skips_filled_and_unknown_sources(hass: HomeAssistant) -> None:
+    """Test sources that already have stations, or are gone, are left alone."""
+    await save(build_store(hass, {
+        "fake": FakeSource({"1": build_station("1", 52.1, -1.2, {"E10": 1.5})}),
+        "gone": FakeSource({"2": build_station("2", 52.1, -1.2, {"E10": 1.5})}),
+    }))
+
+    source = FakeSource({"3": build_station("3", 52.1, -1.2, {"E10": 1.4})})
+    assert not await build_store(hass, {"fake": source}).async_restore(timedelta(hours=1))
+    assert list(source.location_cache) == ["3"]
+
+
+async def test_restore_ignores_old_stations(hass: HomeAssistant) -> None:
+    """Test stations saved longer ago than the maximum age are not restored."""
+    await save(build_store(hass, {
+        "fake": FakeSource({"1": build_station("1", 52.1, -1.2, {"E10": 1.5})})
+    }))
+
+    source = FakeSource()
+    store = build_store(hass, {"fake": source})
+    with patch.object(dt_util, "utcnow", return_value=dt_util.utcnow() + timedelta(hours=2)):
+        assert not await store.async_restore(timedelta(hours=1))
+    assert source.location_cache == {}
+
+
+async def test_restore_without_saved_stations(hass: HomeAssistant) -> None:
+    """Test nothing is restored before the first save."""
+    source = FakeSource()
+    assert not await build_store(hass, {"fake": source}).async_restore(timedelta(hours=1))
+    assert source.location_cache == {}
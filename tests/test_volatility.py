@@ -0,0 +1,92 @@
+"""Tests for the price volatility tracker."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from custom_components.fuel_prices.volatility import (
+    HOURS_PER_WEEK,
+    SMOOTHING,
+    VolatilityTracker,
+)
+
+# A Monday, so the hour of the week is the hour of the day.
+MONDAY = datetime(2024, 1, 1, tzinfo=UTC)
+MIN_INTERVAL = timedelta(minutes=15)
+MAX_INTERVAL = timedelta(hours=6)
+
+
+def build_tracker() -> VolatilityTracker:
+    """Build a tracker that has seen two weeks of a busy morning and a quiet night."""
+    tracker = VolatilityTracker(MIN_INTERVAL, MAX_INTERVAL)
+    for week in range(2):
+        start = MONDAY + timedelta(weeks=week)
+        tracker.record(start + timedelta(hours=5), start + timedelta(hours=5, minutes=30), 0)
+        tracker.record(start + timedelta(hours=8), start + timedelta(hours=8, minutes=30), 10)
+    return tracker
+
+
+def test_record_spreads_changes_over_the_window() -> None:
+    """Test the changes between two polls count for every hour in between."""
+    tracker = VolatilityTracker(MIN_INTERVAL, MAX_INTERVAL)
+    tracker.record(MONDAY + timedelta(hours=8), MONDAY + timedelta(hours=11), 30)
+
+    assert tracker.rates[8:11] == [10, 10, 10]
+    assert tracker.samples[7:12] == [0, 1, 1, 1, 0]
+
+    tracker.record(MONDAY + timedelta(hours=8), MONDAY + timedelta(hours=9), 20)
+    assert tracker.rates[8] == pytest.approx(10 + SMOOTHING * 10)
+    assert tracker.samples[8] == 2
+
+
+def test_interval_falls_back_until_learnt() -> None:
+    """Test the regular interval is used until an hour has enough samples."""
+    tracker = VolatilityTracker(MIN_INTERVAL, MAX_INTERVAL)
+    now = MONDAY + timedelta(hours=8, minutes=10)
+    assert tracker.interval(now, timedelta(hours=1)) == timedelta(hours=1)
+    assert tracker.interval(now, timedelta(minutes=1)) == MIN_INTERVAL
+    assert tracker.interval(now, timedelta(days=1)) == MAX_INTERVAL
+
+    tracker.record(MONDAY + timedelta(hours=8), MONDAY + timedelta(hours=8, minutes=30), 10)
+    assert tracker.interval(now, timedelta(hours=1)) == timedelta(hours=1)
+
+
+def test_interval_follows_volatility() -> None:
+    """Test busy hours are polled often and quiet hours rarely."""
+    tracker = build_tracker()
+    week = timedelta(weeks=2)
+
+    assert tracker.interval(MONDAY + week + timedelta(hours=8, minutes=10),
+                            timedelta(hours=1)) == MIN_INTERVAL
+    # Quiet, but the busy hour starts before the longest interval is up.
+    assert tracker.interval(MONDAY + week + timedelta(hours=5, minutes=10),
+                            timedelta(hours=1)) == timedelta(hours=3, minutes=5)
+    # Nothing learnt yet for the evening, so the regular interval is used.
+    assert tracker.interval(MONDAY + week + timedelta(hours=20),
+                            timedelta(hours=1)) == timedelta(hours=1)
+
+
+def test_interval_without_changes() -> None:
+    """Test a source whose prices never change is polled at the longest interval."""
+    tracker = VolatilityTracker(MIN_INTERVAL, MAX_INTERVAL)
+    for week in range(2):
+        start = MONDAY + timedelta(weeks=week, hours=8)
+        tracker.record(start, start + timedelta(minutes=30), 0)
+
+    assert tracker.interval(MONDAY + timedelta(weeks=2, hours=8), timedelta(hours=1)) == MAX_INTERVAL
+
+
+def test_round_trip() -> None:
+    """Test the learnt rates are restored, and mismatched data is ignored."""
+    tracker = build_tracker()
+
+    restored = VolatilityTracker(MIN_INTERVAL, MAX_INTERVAL)
+    restored.load(tracker.as_dict())
+    assert restored.rates == tracker.rates
+    assert restored.samples == tracker.samples
+
+    ignored = VolatilityTracker(MIN_INTERVAL, MAX_INTERVAL)
+    ignored.load({"rates": [1.0] * (HOURS_PER_WEEK - 1), "samples": [2] * HOURS_PER_WEEK})
+    assert ignored.rates == [0.0] * HOURS_PER_WEEK